@@ -5,17 +5,18 @@ This script creates an interactive dashboard to visualize the analysis results.
 
 import os
 import sqlite3
+import functools
+from collections import defaultdict
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import dash
 from dash import dcc, html
 from dash.dependencies import Input, Output
-import json
+import orjson
 from datetime import datetime
 
 # Paths
@@ -25,6 +26,49 @@ RESULTS_DIR = os.path.join(DATA_DIR, 'results')
 DASHBOARD_DIR = os.path.join(RESULTS_DIR, 'dashboard')
 DB_PATH = os.path.join(DATA_DIR, 'social_media_mental_health.db')
 
+# On-disk cache of loaded frames, keyed on the database mtime
+CACHE_DIR = os.path.join(DASHBOARD_DIR, '.cache')
+
+# Frames computed by SQL aggregation in load_aggregates
+AGGREGATE_FRAMES = ('textblob_counts', 'vader_counts', 'daily_sentiment')
+
+# Frames returned by load_data, in order
+CACHE_FRAMES = ('tweets', 'terms', 'users') + AGGREGATE_FRAMES + ('overview',)
+
+# Rows fetched per chunk when streaming tables out of SQLite
+SQL_CHUNK_SIZE = 50_000
+
+# Terms shown in the top terms chart
+TOP_TERMS_LIMIT = 15
+
+# Terms offered in the tweet table term filter
+TERM_FILTER_LIMIT = 20
+
+# Read-mostly connection tuning: WAL, a ~200 MB page cache, in-memory temp
+# tables and a 256 MB memory map
+SQLITE_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA cache_size=-200000',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA mmap_size=268435456',
+)
+
+# Exported static dashboard images
+STATIC_DIR = os.path.join(DASHBOARD_DIR, 'static')
+
+# Database mtime the static dashboard was last generated from
+STATIC_STAMP_PATH = os.path.join(DASHBOARD_DIR, '.stamp')
+
+# Files that must exist for the static dashboard to be considered current
+STATIC_OUTPUTS = (
+    os.path.join(STATIC_DIR, 'sentiment_distribution.png'),
+    os.path.join(STATIC_DIR, 'top_terms.png'),
+    os.path.join(STATIC_DIR, 'mental_health_percentage.png'),
+    os.path.join(STATIC_DIR, 'engagement_vs_sentiment.png'),
+    os.path.join(DASHBOARD_DIR, 'static_dashboard.html'),
+)
+
 # Create directories if they don't exist
 os.makedirs(RESULTS_DIR, exist_ok=True)
 os.makedirs(DASHBOARD_DIR, exist_ok=True)
@@ -39,43 +83,215 @@ def connect_to_database():
     if not os.path.exists(DB_PATH):
         raise FileNotFoundError(f"Database not found at {DB_PATH}")
         
-    return sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(DB_PATH)
+    
+    # Tune for the read-heavy dashboard queries
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
+        
+    return conn
 
 def load_data():
+    """
+    Load data for dashboard visualization, reusing cached results while the
+    database is unchanged
+    
+    Returns:
+        tuple: DataFrames containing tweets, terms and user metrics, a dict
+            of pre-aggregated sentiment DataFrames, and a dict of overview counts
+    """
+    if not os.path.exists(DB_PATH):
+        raise FileNotFoundError(f"Database not found at {DB_PATH}")
+        
+    frames = dict(zip(CACHE_FRAMES, _load_data_cached(os.path.getmtime(DB_PATH))))
+    aggregates = {name: frames[name] for name in AGGREGATE_FRAMES}
+    overview = {key: int(value) for key, value in frames['overview'].iloc[0].items()}
+    
+    return frames['tweets'], frames['terms'], frames['users'], aggregates, overview
+
+@functools.lru_cache(maxsize=1)
+def _load_data_cached(db_mtime):
+    """
+    Load dashboard data for a given database modification time
+    
+    Args:
+        db_mtime (float): Modification time of the database file
+        
+    Returns:
+        tuple: DataFrames named in CACHE_FRAMES, in order
+    """
+    frames = read_cached_frames(db_mtime)
+    
+    if frames is None:
+        frames = load_data_from_database()
+        write_cached_frames(frames, db_mtime)
+        
+    return frames
+
+def read_cached_frames(db_mtime):
+    """
+    Read DataFrames from the on-disk cache if it matches the database
+    
+    Args:
+        db_mtime (float): Modification time of the database file
+        
+    Returns:
+        tuple: Cached DataFrames, or None if the cache is missing or stale
+    """
+    stamp_path = os.path.join(CACHE_DIR, 'db_mtime')
+    
+    try:
+        with open(stamp_path, 'r') as f:
+            if f.read().strip() != repr(db_mtime):
+                return None
+                
+        frames = tuple(
+            pd.read_parquet(os.path.join(CACHE_DIR, f"{name}.parquet"))
+            for name in CACHE_FRAMES
+        )
+    except Exception:
+        return None
+    
+    # Parquet returns list columns as arrays
+    tweets_df = frames[0]
+    tweets_df['extracted_terms'] = tweets_df['extracted_terms'].map(
+        lambda x: list(x) if x is not None else []
+    )
+    
+    return frames
+
+def write_cached_frames(frames, db_mtime):
+    """
+    Write DataFrames to the on-disk cache
+    
+    Args:
+        frames (tuple): DataFrames to cache
+        db_mtime (float): Modification time of the database file
+    """
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        
+        for name, df in zip(CACHE_FRAMES, frames):
+            df.to_parquet(os.path.join(CACHE_DIR, f"{name}.parquet"), index=False)
+            
+        # Write the stamp last so a partial cache is never considered valid
+        with open(os.path.join(CACHE_DIR, 'db_mtime'), 'w') as f:
+            f.write(repr(db_mtime))
+    except Exception as e:
+        print(f"Could not write data cache: {e}")
+
+def read_sql_frame(query, conn):
+    """
+    Read a query result in chunks into an Arrow-backed DataFrame
+    
+    Args:
+        query (str): SQL query
+        conn (sqlite3.Connection): Database connection
+        
+    Returns:
+        pd.DataFrame: Query result
+    """
+    chunks = pd.read_sql_query(query, conn, chunksize=SQL_CHUNK_SIZE, dtype_backend='pyarrow')
+    return pd.concat(chunks, ignore_index=True)
+
+def load_overview_stats(conn):
+    """
+    Load the overview counters in a single query
+    
+    Args:
+        conn (sqlite3.Connection): Database connection
+        
+    Returns:
+        dict: Tweet, mental health tweet, term and user counts
+    """
+    query = """
+    SELECT 
+        (SELECT COUNT(*)
+         FROM tweets t
+         JOIN tweet_sentiment s ON t.tweet_id = s.tweet_id) AS tweet_count,
+        (SELECT COALESCE(SUM(s.contains_mental_health_term), 0)
+         FROM tweets t
+         JOIN tweet_sentiment s ON t.tweet_id = s.tweet_id) AS mental_health_tweet_count,
+        (SELECT COUNT(*) FROM mental_health_terms) AS term_count,
+        (SELECT COUNT(*) FROM user_metrics) AS user_count
+    """
+    
+    cursor = conn.execute(query)
+    columns = [description[0] for description in cursor.description]
+    
+    return dict(zip(columns, cursor.fetchone()))
+
+def load_aggregates(conn):
+    """
+    Load sentiment aggregates computed inside the database
+    
+    Args:
+        conn (sqlite3.Connection): Database connection
+        
+    Returns:
+        tuple: DataFrames of TextBlob counts, VADER counts and daily sentiment
+    """
+    textblob_query = """
+    SELECT textblob_category AS category, COUNT(*) AS count
+    FROM tweet_sentiment
+    GROUP BY textblob_category
+    ORDER BY count DESC
+    """
+    
+    textblob_counts = pd.read_sql_query(textblob_query, conn)
+    
+    vader_query = """
+    SELECT vader_category AS category, COUNT(*) AS count
+    FROM tweet_sentiment
+    GROUP BY vader_category
+    ORDER BY count DESC
+    """
+    
+    vader_counts = pd.read_sql_query(vader_query, conn)
+    
+    # created_at is stored as ISO-8601 by database_setup, which also
+    # migrates older rows; rows SQLite cannot parse are skipped
+    daily_query = """
+    SELECT 
+        DATE(t.created_at) AS date,
+        AVG(s.textblob_polarity) AS textblob_polarity,
+        AVG(s.vader_compound) AS vader_compound
+    FROM tweets t
+    JOIN tweet_sentiment s ON t.tweet_id = s.tweet_id
+    WHERE DATE(t.created_at) IS NOT NULL
+    GROUP BY DATE(t.created_at)
+    ORDER BY date
+    """
+    
+    daily_sentiment = pd.read_sql_query(daily_query, conn)
+    daily_sentiment['date'] = pd.to_datetime(daily_sentiment['date'], format='%Y-%m-%d', cache=True)
+    
+    return textblob_counts, vader_counts, daily_sentiment
+
+def load_data_from_database():
     """
     Load data from the database for dashboard visualization
     
     Returns:
-        tuple: DataFrames containing tweets, sentiment, terms, and user metrics
+        tuple: DataFrames named in CACHE_FRAMES, in order
     """
     conn = connect_to_database()
     
-    # Load tweets with sentiment
+    # Load tweets with sentiment, limited to the columns the dashboard displays
     tweets_query = """
     SELECT 
         t.tweet_id,
-        t.tweet_text,
         t.cleaned_text,
-        t.created_at,
-        t.search_keyword,
-        t.username,
-        t.retweet_count,
-        t.favorite_count,
         s.textblob_polarity,
-        s.textblob_subjectivity,
         s.textblob_category,
         s.vader_compound,
-        s.vader_positive,
-        s.vader_negative,
-        s.vader_neutral,
-        s.vader_category,
         s.contains_mental_health_term,
         s.mental_health_terms
     FROM tweets t
     JOIN tweet_sentiment s ON t.tweet_id = s.tweet_id
     """
     
-    tweets_df = pd.read_sql_query(tweets_query, conn)
+    tweets_df = read_sql_frame(tweets_query, conn)
     
     # Load mental health terms
     terms_query = """
@@ -84,7 +300,7 @@ def load_data():
     ORDER BY occurrence_count DESC
     """
     
-    terms_df = pd.read_sql_query(terms_query, conn)
+    terms_df = read_sql_frame(terms_query, conn)
     
     # Load user metrics
     users_query = """
@@ -92,26 +308,31 @@ def load_data():
     FROM user_metrics
     """
     
-    users_df = pd.read_sql_query(users_query, conn)
+    users_df = read_sql_frame(users_query, conn)
     
-    # Process mental health terms from JSON
-    def extract_terms(terms_json):
-        try:
-            return json.loads(terms_json)
-        except:
-            return []
-            
-    tweets_df['extracted_terms'] = tweets_df['mental_health_terms'].apply(extract_terms)
+    # Calculate percentage of mental health tweets per user
+    if {'mental_health_tweet_count', 'tweet_count'}.issubset(users_df.columns):
+        mh_counts = users_df['mental_health_tweet_count'].to_numpy(dtype='float64', na_value=np.nan)
+        tweet_counts = users_df['tweet_count'].to_numpy(dtype='float64', na_value=np.nan)
+        users_df['mental_health_percentage'] = mh_counts / np.maximum(tweet_counts, 1) * 100
     
-    # Convert created_at to datetime
-    try:
-        tweets_df['created_at'] = pd.to_datetime(tweets_df['created_at'])
-    except:
-        pass
+    # Process mental health terms from JSON (database_setup always writes valid JSON)
+    raw_terms = tweets_df['mental_health_terms'].to_numpy()
+    tweets_df['extracted_terms'] = [
+        orjson.loads(x) if isinstance(x, (str, bytes)) and x else []
+        for x in raw_terms
+    ]
+    
+    # Store low-cardinality sentiment labels as categoricals
+    tweets_df['textblob_category'] = tweets_df['textblob_category'].astype('category')
+    
+    # Load sentiment aggregates and overview counters
+    aggregates = load_aggregates(conn)
+    overview_df = pd.DataFrame([load_overview_stats(conn)])
     
     conn.close()
     
-    return tweets_df, terms_df, users_df
+    return (tweets_df, terms_df, users_df) + aggregates + (overview_df,)
 
 def create_dashboard():
     """
@@ -119,13 +340,23 @@ def create_dashboard():
     """
     # Load data
     try:
-        tweets_df, terms_df, users_df = load_data()
+        tweets_df, terms_df, users_df, aggregates, overview = load_data()
     except Exception as e:
         print(f"Error loading data: {e}")
         return
     
+    # Slice the terms once; terms_df is not needed after the layout is built
+    top_terms = terms_df.head(TOP_TERMS_LIMIT)
+    filter_terms = terms_df['term_text'].head(TERM_FILTER_LIMIT).tolist()
+    
+    # Precompute term -> row positions so the tweet table filter is a lookup
+    term_index = build_term_index(tweets_df)
+    no_rows = np.empty(0, dtype=np.int64)
+    
     # Initialize Dash app
-    app = dash.Dash(__name__)
+    # Components inside the tabs only exist once rendered, so their callbacks
+    # are registered before their IDs appear in the layout
+    app = dash.Dash(__name__, suppress_callback_exceptions=True)
     
     # Define layout
     app.layout = html.Div([
@@ -133,10 +364,10 @@ def create_dashboard():
         
         html.Div([
             html.H2("Overview"),
-            html.P(f"Total tweets analyzed: {len(tweets_df)}"),
-            html.P(f"Tweets containing mental health terms: {tweets_df['contains_mental_health_term'].sum()}"),
-            html.P(f"Unique mental health terms identified: {len(terms_df)}"),
-            html.P(f"Users analyzed: {len(users_df)}")
+            html.P(f"Total tweets analyzed: {overview['tweet_count']}"),
+            html.P(f"Tweets containing mental health terms: {overview['mental_health_tweet_count']}"),
+            html.P(f"Unique mental health terms identified: {overview['term_count']}"),
+            html.P(f"Users analyzed: {overview['user_count']}")
         ]),
         
         html.Div([
@@ -146,14 +377,15 @@ def create_dashboard():
             html.H3("Sentiment Distribution"),
             dcc.Graph(
                 id='sentiment-distribution',
-                figure=create_sentiment_distribution_figure(tweets_df)
+                figure=figure_to_dict(create_sentiment_distribution_figure(aggregates['textblob_counts'],
+                                                                           aggregates['vader_counts']))
             ),
             
             # Sentiment over time
             html.H3("Sentiment Over Time"),
             dcc.Graph(
                 id='sentiment-time',
-                figure=create_sentiment_time_figure(tweets_df)
+                figure=figure_to_dict(create_sentiment_time_figure(aggregates['daily_sentiment']))
             )
         ]),
         
@@ -164,66 +396,27 @@ def create_dashboard():
             html.H3("Top Mental Health Terms"),
             dcc.Graph(
                 id='top-terms',
-                figure=create_top_terms_figure(terms_df)
+                figure=figure_to_dict(create_top_terms_figure(top_terms))
             ),
             
             # Sentiment by term
             html.H3("Sentiment by Mental Health Term"),
             dcc.Graph(
                 id='sentiment-by-term',
-                figure=create_sentiment_by_term_figure(tweets_df)
+                figure=figure_to_dict(create_sentiment_by_term_figure(tweets_df))
             )
         ]),
         
-        html.Div([
-            html.H2("User Analysis"),
-            
-            # Mental health tweet percentage distribution
-            html.H3("Mental Health Tweet Percentage Distribution"),
-            dcc.Graph(
-                id='mental-health-percentage',
-                figure=create_mental_health_percentage_figure(users_df)
-            ),
-            
-            # Engagement vs sentiment
-            html.H3("Engagement vs Sentiment"),
-            dcc.Graph(
-                id='engagement-sentiment',
-                figure=create_engagement_sentiment_figure(users_df)
-            )
-        ]),
-        
-        html.Div([
-            html.H2("Tweet Explorer"),
-            
-            # Filters
-            html.Div([
-                html.Label("Filter by Sentiment:"),
-                dcc.Dropdown(
-                    id='sentiment-filter',
-                    options=[
-                        {'label': 'All', 'value': 'all'},
-                        {'label': 'Positive', 'value': 'positive'},
-                        {'label': 'Neutral', 'value': 'neutral'},
-                        {'label': 'Negative', 'value': 'negative'}
-                    ],
-                    value='all'
-                ),
-                
-                html.Label("Filter by Mental Health Term:"),
-                dcc.Dropdown(
-                    id='term-filter',
-                    options=[{'label': 'All', 'value': 'all'}] + [
-                        {'label': term, 'value': term} 
-                        for term in terms_df['term_text'].head(20)
-                    ],
-                    value='all'
-                )
-            ]),
-            
-            # Tweet table
-            html.Div(id='tweet-table')
-        ]),
+        # User Analysis and Tweet Explorer are rendered on demand when their tab is selected
+        dcc.Tabs(
+            id='detail-tabs',
+            value='user-analysis',
+            children=[
+                dcc.Tab(label="User Analysis", value='user-analysis'),
+                dcc.Tab(label="Tweet Explorer", value='tweet-explorer')
+            ]
+        ),
+        html.Div(id='detail-pane'),
         
         html.Footer([
             html.P(f"Dashboard generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"),
@@ -231,35 +424,57 @@ def create_dashboard():
         ])
     ])
     
+    del terms_df, top_terms
+    
     # Define callbacks
+    @app.callback(
+        Output('detail-pane', 'children'),
+        [Input('detail-tabs', 'value')]
+    )
+    @functools.lru_cache(maxsize=None)
+    def render_detail_pane(tab):
+        # Each pane is built once and reused on later tab switches
+        if tab == 'tweet-explorer':
+            return create_tweet_explorer_pane(filter_terms)
+        
+        return create_user_analysis_pane(users_df)
+    
     @app.callback(
         Output('tweet-table', 'children'),
         [Input('sentiment-filter', 'value'),
          Input('term-filter', 'value')]
     )
     def update_tweet_table(sentiment, term):
-        filtered_df = tweets_df.copy()
-        
-        # Filter by sentiment
-        if sentiment != 'all':
-            filtered_df = filtered_df[filtered_df['textblob_category'] == sentiment]
+        # Filter on row positions so only the displayed rows are materialized
+        positions = None
         
         # Filter by term
         if term != 'all':
-            filtered_df = filtered_df[filtered_df['extracted_terms'].apply(lambda x: term in x if isinstance(x, list) else False)]
+            positions = term_index.get(term, no_rows)
+        
+        # Filter by sentiment
+        if sentiment != 'all':
+            matches = (tweets_df['textblob_category'] == sentiment).to_numpy(dtype=bool, na_value=False)
+            positions = np.flatnonzero(matches) if positions is None else positions[matches[positions]]
         
         # Limit to 20 tweets
-        filtered_df = filtered_df.head(20)
+        if positions is None:
+            filtered_df = tweets_df.head(20)
+        else:
+            filtered_df = tweets_df.iloc[positions[:20]]
         
         # Create table
         table_rows = []
         
-        for _, row in filtered_df.iterrows():
+        for text, category, polarity, terms in zip(filtered_df['cleaned_text'],
+                                                   filtered_df['textblob_category'],
+                                                   filtered_df['textblob_polarity'],
+                                                   filtered_df['extracted_terms']):
             table_rows.append(html.Tr([
-                html.Td(row['cleaned_text']),
-                html.Td(row['textblob_category']),
-                html.Td(f"{row['textblob_polarity']:.2f}"),
-                html.Td(', '.join(row['extracted_terms']) if isinstance(row['extracted_terms'], list) else '')
+                html.Td(text),
+                html.Td(category),
+                html.Td(f"{polarity:.2f}"),
+                html.Td(', '.join(terms) if isinstance(terms, list) else '')
             ]))
         
         return html.Table([
@@ -286,23 +501,120 @@ def create_dashboard():
     # Return app for running
     return app
 
-def create_sentiment_distribution_figure(tweets_df):
+def figure_to_dict(fig):
     """
-    Create a figure showing sentiment distribution
+    Serialize a figure once into plain JSON-compatible data
     
     Args:
-        tweets_df (pd.DataFrame): DataFrame containing tweets with sentiment
+        fig (plotly.graph_objects.Figure): Figure to serialize
         
     Returns:
-        plotly.graph_objects.Figure: Sentiment distribution figure
+        dict: Figure data and layout
     """
-    # Count sentiment categories
-    textblob_counts = tweets_df['textblob_category'].value_counts().reset_index()
-    textblob_counts.columns = ['category', 'count']
+    # dcc.Graph re-serializes its figure on every request; a plain dict is cheap to re-emit
+    return orjson.loads(pio.to_json(fig))
+
+def build_term_index(tweets_df):
+    """
+    Build an inverted index from mental health term to tweet row positions
     
-    vader_counts = tweets_df['vader_category'].value_counts().reset_index()
-    vader_counts.columns = ['category', 'count']
+    Args:
+        tweets_df (pd.DataFrame): DataFrame containing tweets with extracted terms
+        
+    Returns:
+        dict: Mapping of term to a sorted array of row positions
+    """
+    index = defaultdict(list)
     
+    for i, terms in enumerate(tweets_df['extracted_terms'].to_numpy()):
+        if isinstance(terms, list):
+            # A term can appear more than once in a tweet's list
+            for term in set(terms):
+                index[term].append(i)
+                
+    return {term: np.asarray(rows, dtype=np.int64) for term, rows in index.items()}
+
+def create_user_analysis_pane(users_df):
+    """
+    Create the User Analysis tab content
+    
+    Args:
+        users_df (pd.DataFrame): DataFrame containing user metrics
+        
+    Returns:
+        dash.html.Div: User Analysis section
+    """
+    return html.Div([
+        html.H2("User Analysis"),
+        
+        # Mental health tweet percentage distribution
+        html.H3("Mental Health Tweet Percentage Distribution"),
+        dcc.Graph(
+            id='mental-health-percentage',
+            figure=figure_to_dict(create_mental_health_percentage_figure(users_df))
+        ),
+        
+        # Engagement vs sentiment
+        html.H3("Engagement vs Sentiment"),
+        dcc.Graph(
+            id='engagement-sentiment',
+            figure=figure_to_dict(create_engagement_sentiment_figure(users_df))
+        )
+    ])
+
+def create_tweet_explorer_pane(filter_terms):
+    """
+    Create the Tweet Explorer tab content
+    
+    Args:
+        filter_terms (list): Mental health terms offered in the term filter
+        
+    Returns:
+        dash.html.Div: Tweet Explorer section with filters and table container
+    """
+    return html.Div([
+        html.H2("Tweet Explorer"),
+        
+        # Filters
+        html.Div([
+            html.Label("Filter by Sentiment:"),
+            dcc.Dropdown(
+                id='sentiment-filter',
+                options=[
+                    {'label': 'All', 'value': 'all'},
+                    {'label': 'Positive', 'value': 'positive'},
+                    {'label': 'Neutral', 'value': 'neutral'},
+                    {'label': 'Negative', 'value': 'negative'}
+                ],
+                value='all'
+            ),
+            
+            html.Label("Filter by Mental Health Term:"),
+            dcc.Dropdown(
+                id='term-filter',
+                options=[{'label': 'All', 'value': 'all'}] + [
+                    {'label': term, 'value': term} 
+                    for term in filter_terms
+                ],
+                value='all'
+            )
+        ]),
+        
+        # Tweet table
+        html.Div(id='tweet-table')
+    ])
+
+def create_sentiment_distribution_figure(textblob_counts, vader_counts):
+    """
+    Create a figure showing sentiment distribution
+    
+    Args:
+        textblob_counts (pd.DataFrame): Tweet counts per TextBlob category
+        vader_counts (pd.DataFrame): Tweet counts per VADER category
+        
+    Returns:
+        plotly.graph_objects.Figure: Sentiment distribution figure
+    """
     # Create subplots
     fig = make_subplots(rows=1, cols=2, subplot_titles=("TextBlob Sentiment", "VADER Sentiment"))
     
@@ -334,18 +646,18 @@ def create_sentiment_distribution_figure(tweets_df):
     
     return fig
 
-def create_sentiment_time_figure(tweets_df):
+def create_sentiment_time_figure(daily_sentiment):
     """
     Create a figure showing sentiment over time
     
     Args:
-        tweets_df (pd.DataFrame): DataFrame containing tweets with sentiment
+        daily_sentiment (pd.DataFrame): Average sentiment per day
         
     Returns:
         plotly.graph_objects.Figure: Sentiment over time figure
     """
-    # Check if created_at is datetime
-    if 'created_at' not in tweets_df.columns or not pd.api.types.is_datetime64_any_dtype(tweets_df['created_at']):
+    # Check if any tweets had a usable date
+    if daily_sentiment.empty:
         # Create a dummy figure if time data is not available
         fig = go.Figure()
         fig.add_annotation(
@@ -360,13 +672,6 @@ def create_sentiment_time_figure(tweets_df):
         )
         return fig
     
-    # Group by date and calculate average sentiment
-    tweets_df['date'] = tweets_df['created_at'].dt.date
-    daily_sentiment = tweets_df.groupby('date').agg({
-        'textblob_polarity': 'mean',
-        'vader_compound': 'mean'
-    }).reset_index()
-    
     # Create figure
     fig = go.Figure()
     
@@ -414,19 +719,16 @@ def create_sentiment_time_figure(tweets_df):
     
     return fig
 
-def create_top_terms_figure(terms_df):
+def create_top_terms_figure(top_terms):
     """
     Create a figure showing top mental health terms
     
     Args:
-        terms_df (pd.DataFrame): DataFrame containing mental health terms
+        top_terms (pd.DataFrame): Most frequent mental health terms, in order
         
     Returns:
         plotly.graph_objects.Figure: Top terms figure
     """
-    # Get top 15 terms
-    top_terms = terms_df.head(15)
-    
     # Create figure
     fig = go.Figure()
     
@@ -459,20 +761,11 @@ def create_sentiment_by_term_figure(tweets_df):
     Returns:
         plotly.graph_objects.Figure: Sentiment by term figure
     """
-    # Process mental health terms and sentiment
-    term_sentiment = []
-    
-    for _, row in tweets_df.iterrows():
-        terms = row['extracted_terms']
-        if isinstance(terms, list) and terms:
-            for term in terms:
-                term_sentiment.append({
-                    'term': term,
-                    'textblob_polarity': row['textblob_polarity'],
-                    'vader_compound': row['vader_compound']
-                })
+    # Expand to one row per (tweet, term) pair
+    exploded = tweets_df[['textblob_polarity', 'vader_compound', 'extracted_terms']].explode('extracted_terms')
+    exploded = exploded[exploded['extracted_terms'].notna()]
     
-    if not term_sentiment:
+    if exploded.empty:
         # Create a dummy figure if no data
         fig = go.Figure()
         fig.add_annotation(
@@ -487,15 +780,12 @@ def create_sentiment_by_term_figure(tweets_df):
         )
         return fig
     
-    # Convert to DataFrame
-    term_sentiment_df = pd.DataFrame(term_sentiment)
-    
     # Calculate average sentiment by term
-    term_avg = term_sentiment_df.groupby('term').agg({
-        'textblob_polarity': 'mean',
-        'vader_compound': 'mean',
-        'term': 'count'
-    }).rename(columns={'term': 'count'}).reset_index()
+    term_avg = exploded.groupby('extracted_terms').agg(
+        textblob_polarity=('textblob_polarity', 'mean'),
+        vader_compound=('vader_compound', 'mean'),
+        count=('extracted_terms', 'size')
+    ).reset_index().rename(columns={'extracted_terms': 'term'})
     
     # Filter to terms with at least 3 occurrences
     term_avg = term_avg[term_avg['count'] >= 3]
@@ -515,8 +805,9 @@ def create_sentiment_by_term_figure(tweets_df):
         )
         return fig
     
-    # Sort by TextBlob polarity
-    term_avg = term_avg.sort_values('textblob_polarity')
+    # Sort by TextBlob polarity on the underlying arrays
+    polarities = term_avg['textblob_polarity'].to_numpy(dtype='float64', na_value=np.nan)
+    order = np.argsort(polarities, kind='stable')
     
     # Create figure
     fig = go.Figure()
@@ -524,8 +815,8 @@ def create_sentiment_by_term_figure(tweets_df):
     # Add TextBlob sentiment bar chart
     fig.add_trace(
         go.Bar(
-            y=term_avg['term'],
-            x=term_avg['textblob_polarity'],
+            y=term_avg['term'].to_numpy()[order],
+            x=polarities[order],
             name="TextBlob Polarity",
             orientation='h'
         )
@@ -565,7 +856,7 @@ def create_mental_health_percentage_figure(users_df):
     Returns:
         plotly.graph_objects.Figure: Mental health percentage figure
     """
-    if 'mental_health_tweet_count' not in users_df.columns or 'tweet_count' not in users_df.columns:
+    if 'mental_health_percentage' not in users_df.columns:
         # Create a dummy figure if data is not available
         fig = go.Figure()
         fig.add_annotation(
@@ -580,10 +871,6 @@ def create_mental_health_percentage_figure(users_df):
         )
         return fig
     
-    # Calculate percentage
-    users_df['mental_health_percentage'] = (users_df['mental_health_tweet_count'] / 
-                                          users_df['tweet_count']) * 100
-    
     # Create figure
     fig = go.Figure()
     
@@ -673,81 +960,85 @@ def create_engagement_sentiment_figure(users_df):
     
     return fig
 
+def static_dashboard_is_current():
+    """
+    Check whether the static dashboard was generated from the current database
+    
+    Returns:
+        bool: True if all static outputs exist and the stamp matches the database
+    """
+    if not os.path.exists(DB_PATH) or not os.path.exists(STATIC_STAMP_PATH):
+        return False
+        
+    if not all(os.path.exists(path) for path in STATIC_OUTPUTS):
+        return False
+        
+    with open(STATIC_STAMP_PATH, 'r') as f:
+        return f.read().strip() == repr(os.path.getmtime(DB_PATH))
+
+def static_image_tag(filename, alt, exported):
+    """
+    Build the HTML for one static dashboard image
+    
+    Only images exported in the current run are linked, so a failed export
+    never points at a missing or stale file.
+    
+    Args:
+        filename (str): Image file name in the static directory
+        alt (str): Image description
+        exported (set): File names exported in this run
+        
+    Returns:
+        str: img tag, or a placeholder if the image was not exported
+    """
+    if filename in exported:
+        return f'<img src="static/{filename}" alt="{alt}">'
+        
+    return f'<p>{alt} image not available</p>'
+
 def generate_static_dashboard():
     """
     Generate static dashboard files for offline viewing
     """
+    # Skip regeneration if the database hasn't changed since the last run
+    if static_dashboard_is_current():
+        print(f"Static dashboard is up to date in {DASHBOARD_DIR}")
+        return
+    
     # Load data
     try:
-        tweets_df, terms_df, users_df = load_data()
+        db_mtime = os.path.getmtime(DB_PATH)
+        tweets_df, terms_df, users_df, aggregates, overview = load_data()
     except Exception as e:
         print(f"Error loading data: {e}")
         return
     
     # Create output directory
-    static_dir = os.path.join(DASHBOARD_DIR, 'static')
+    static_dir = STATIC_DIR
     os.makedirs(static_dir, exist_ok=True)
     
-    # Generate individual plots
-    
-    # 1. Sentiment Distribution
-    plt.figure(figsize=(12, 6))
-    
-    plt.subplot(1, 2, 1)
-    sns.countplot(x='textblob_category', data=tweets_df)
-    plt.title('TextBlob Sentiment Distribution')
-    plt.xlabel('Sentiment Category')
-    plt.ylabel('Count')
-    
-    plt.subplot(1, 2, 2)
-    sns.countplot(x='vader_category', data=tweets_df)
-    plt.title('VADER Sentiment Distribution')
-    plt.xlabel('Sentiment Category')
-    plt.ylabel('Count')
-    
-    plt.tight_layout()
-    plt.savefig(os.path.join(static_dir, 'sentiment_distribution.png'))
-    plt.close()
-    
-    # 2. Top Mental Health Terms
-    plt.figure(figsize=(10, 8))
-    top_terms = terms_df.head(15)
-    sns.barplot(y='term_text', x='occurrence_count', data=top_terms)
-    plt.title('Top 15 Mental Health Terms')
-    plt.xlabel('Occurrence Count')
-    plt.ylabel('Term')
-    plt.tight_layout()
-    plt.savefig(os.path.join(static_dir, 'top_terms.png'))
-    plt.close()
-    
-    # 3. User Metrics
-    if 'mental_health_tweet_count' in users_df.columns and 'tweet_count' in users_df.columns:
-        users_df['mental_health_percentage'] = (users_df['mental_health_tweet_count'] / 
-                                              users_df['tweet_count']) * 100
-        
-        plt.figure(figsize=(10, 6))
-        sns.histplot(users_df['mental_health_percentage'], bins=20)
-        plt.title('Distribution of Mental Health Tweet Percentage by User')
-        plt.xlabel('Percentage of Tweets Related to Mental Health')
-        plt.ylabel('Number of Users')
-        plt.tight_layout()
-        plt.savefig(os.path.join(static_dir, 'mental_health_percentage.png'))
-        plt.close()
-    
-    # 4. Engagement vs Sentiment
-    if 'avg_engagement' in users_df.columns and 'avg_textblob_polarity' in users_df.columns:
-        plt.figure(figsize=(10, 6))
-        sns.scatterplot(x='avg_engagement', y='avg_textblob_polarity', data=users_df)
-        plt.axhline(y=0, color='gray', linestyle='--')
-        plt.title('Average Engagement vs Average Sentiment')
-        plt.xlabel('Average Engagement')
-        plt.ylabel('Average Sentiment Polarity (TextBlob)')
-        plt.tight_layout()
-        plt.savefig(os.path.join(static_dir, 'engagement_vs_sentiment.png'))
-        plt.close()
+    # Export the interactive figures as static images
+    static_figures = [
+        ('sentiment_distribution.png',
+         create_sentiment_distribution_figure(aggregates['textblob_counts'], aggregates['vader_counts']),
+         1200),
+        ('top_terms.png', create_top_terms_figure(terms_df.head(TOP_TERMS_LIMIT)), 1000),
+        ('mental_health_percentage.png', create_mental_health_percentage_figure(users_df), 1000),
+        ('engagement_vs_sentiment.png', create_engagement_sentiment_figure(users_df), 1000)
+    ]
+    
+    # Image export needs kaleido; a renderer failure only loses that image
+    exported = set()
+    for filename, fig, width in static_figures:
+        try:
+            fig.write_image(os.path.join(static_dir, filename), width=width)
+            exported.add(filename)
+        except Exception as e:
+            print(f"Error exporting {filename}: {e}")
+    export_failed = len(exported) < len(static_figures)
     
     # Create HTML dashboard
-    html_content = f"""
+    html_header = f"""
     <!DOCTYPE html>
     <html>
     <head>
@@ -817,22 +1108,22 @@ def generate_static_dashboard():
             
             <div class="section">
                 <h2>Overview</h2>
-                <p>Total tweets analyzed: {len(tweets_df)}</p>
-                <p>Tweets containing mental health terms: {tweets_df['contains_mental_health_term'].sum()}</p>
-                <p>Unique mental health terms identified: {len(terms_df)}</p>
-                <p>Users analyzed: {len(users_df)}</p>
+                <p>Total tweets analyzed: {overview['tweet_count']}</p>
+                <p>Tweets containing mental health terms: {overview['mental_health_tweet_count']}</p>
+                <p>Unique mental health terms identified: {overview['term_count']}</p>
+                <p>Users analyzed: {overview['user_count']}</p>
             </div>
             
             <div class="section">
                 <h2>Sentiment Analysis</h2>
                 <h3>Sentiment Distribution</h3>
-                <img src="static/sentiment_distribution.png" alt="Sentiment Distribution">
+                {static_image_tag('sentiment_distribution.png', 'Sentiment Distribution', exported)}
             </div>
             
             <div class="section">
                 <h2>Mental Health Terms Analysis</h2>
                 <h3>Top Mental Health Terms</h3>
-                <img src="static/top_terms.png" alt="Top Mental Health Terms">
+                {static_image_tag('top_terms.png', 'Top Mental Health Terms', exported)}
             </div>
             
             <div class="section">
@@ -840,11 +1131,11 @@ def generate_static_dashboard():
                 <div class="row">
                     <div class="col">
                         <h3>Mental Health Tweet Percentage</h3>
-                        <img src="static/mental_health_percentage.png" alt="Mental Health Tweet Percentage">
+                        {static_image_tag('mental_health_percentage.png', 'Mental Health Tweet Percentage', exported)}
                     </div>
                     <div class="col">
                         <h3>Engagement vs Sentiment</h3>
-                        <img src="static/engagement_vs_sentiment.png" alt="Engagement vs Sentiment">
+                        {static_image_tag('engagement_vs_sentiment.png', 'Engagement vs Sentiment', exported)}
                     </div>
                 </div>
             </div>
@@ -864,19 +1155,21 @@ def generate_static_dashboard():
     
     # Add sample tweets
     sample_tweets = tweets_df[tweets_df['contains_mental_health_term'] == 1].head(10)
-    for _, row in sample_tweets.iterrows():
-        terms = row['extracted_terms']
+    sample_columns = ['cleaned_text', 'textblob_category', 'textblob_polarity', 'extracted_terms']
+    rows = []
+    
+    for text, category, polarity, terms in sample_tweets[sample_columns].itertuples(index=False, name=None):
         terms_str = ', '.join(terms) if isinstance(terms, list) else ''
         
-        html_content += f"""
+        rows.append(f"""
                         <tr>
-                            <td>{row['cleaned_text']}</td>
-                            <td>{row['textblob_category']} ({row['textblob_polarity']:.2f})</td>
+                            <td>{text}</td>
+                            <td>{category} ({polarity:.2f})</td>
                             <td>{terms_str}</td>
                         </tr>
-        """
+        """)
     
-    html_content += f"""
+    html_footer = f"""
                     </tbody>
                 </table>
             </div>
@@ -890,21 +1183,32 @@ def generate_static_dashboard():
     </html>
     """
     
+    html_content = html_header + "".join(rows) + html_footer
+    
     # Save HTML file
     html_path = os.path.join(DASHBOARD_DIR, 'static_dashboard.html')
     with open(html_path, 'w') as f:
         f.write(html_content)
     
+    # Record the database version the static files were built from, unless
+    # an image is missing and should be retried on the next run
+    if not export_failed:
+        with open(STATIC_STAMP_PATH, 'w') as f:
+            f.write(repr(db_mtime))
+    
     print(f"Static dashboard saved to {html_path}")
 
 def main():
     """Main function to create dashboard"""
     print(f"Starting dashboard generation at {datetime.now().isoformat()}")
     
+    # The static dashboard is optional; don't let it block the interactive one
     try:
-        # Generate static dashboard
         generate_static_dashboard()
-        
+    except Exception as e:
+        print(f"Error generating static dashboard: {e}")
+    
+    try:
         # Create interactive dashboard
         app = create_dashboard()
         
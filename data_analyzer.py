@@ -7,10 +7,13 @@ import os
 import sqlite3
 import pandas as pd
 import numpy as np
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
-import json
+from collections import defaultdict
+import orjson
+from numba import njit
 
 # Paths
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -19,6 +22,53 @@ RESULTS_DIR = os.path.join(DATA_DIR, 'results')
 DB_PATH = os.path.join(DATA_DIR, 'social_media_mental_health.db')
 os.makedirs(RESULTS_DIR, exist_ok=True)
 
+# Rows fetched per chunk by the pandas term aggregation
+SQL_CHUNK_SIZE = 100_000
+
+# Tweets joined with their sentiment, shared by the term sentiment queries
+TWEET_FULL_CTE = """
+WITH tweet_full AS (
+    SELECT 
+        t.tweet_id,
+        s.textblob_polarity,
+        s.vader_compound,
+        s.mental_health_terms,
+        s.contains_mental_health_term
+    FROM tweets t
+    JOIN tweet_sentiment s ON t.tweet_id = s.tweet_id
+)
+"""
+
+# Plot output resolution
+PLOT_DPI = 90
+
+# Single figure reused by every plot
+FIG = plt.figure()
+
+def new_plot(figsize, ncols=1):
+    """
+    Clear the shared figure and lay out fresh axes on it
+    
+    Args:
+        figsize (tuple): Figure size in inches
+        ncols (int): Number of side-by-side axes
+        
+    Returns:
+        matplotlib.axes.Axes or np.ndarray: Axes to draw on
+    """
+    FIG.clear()
+    FIG.set_size_inches(figsize)
+    return FIG.subplots(1, ncols)
+
+def save_plot(path):
+    """
+    Save the shared figure
+    
+    Args:
+        path (str): Output image path
+    """
+    FIG.savefig(path, dpi=PLOT_DPI)
+
 def connect_to_database():
     """
     Connect to the SQLite database
@@ -29,7 +79,14 @@ def connect_to_database():
     if not os.path.exists(DB_PATH):
         raise FileNotFoundError(f"Database not found at {DB_PATH}")
         
-    return sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(DB_PATH)
+    
+    # Fewer fsyncs and a larger page cache for the analytic passes
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA cache_size=-65536')
+    
+    return conn
 
 def analyze_sentiment_distribution(conn):
     """
@@ -39,47 +96,48 @@ def analyze_sentiment_distribution(conn):
         conn (sqlite3.Connection): Database connection
         
     Returns:
-        pd.DataFrame: Sentiment distribution data
+        tuple: TextBlob and VADER sentiment distribution data
     """
     print("Analyzing sentiment distribution...")
     
-    # Query sentiment distribution
-    query = """
-    SELECT 
-        textblob_category, 
-        vader_category,
-        COUNT(*) as tweet_count
+    # Query separate distributions for TextBlob and VADER
+    textblob_query = """
+    SELECT textblob_category, COUNT(*) as tweet_count
     FROM tweet_sentiment
-    GROUP BY textblob_category, vader_category
+    GROUP BY textblob_category
+    ORDER BY textblob_category
     """
     
-    sentiment_dist = pd.read_sql_query(query, conn)
+    vader_query = """
+    SELECT vader_category, COUNT(*) as tweet_count
+    FROM tweet_sentiment
+    GROUP BY vader_category
+    ORDER BY vader_category
+    """
     
-    # Create separate distributions for TextBlob and VADER
-    textblob_dist = sentiment_dist.groupby('textblob_category').agg({'tweet_count': 'sum'}).reset_index()
-    vader_dist = sentiment_dist.groupby('vader_category').agg({'tweet_count': 'sum'}).reset_index()
+    textblob_dist = pd.read_sql_query(textblob_query, conn)
+    vader_dist = pd.read_sql_query(vader_query, conn)
     
     # Plot distributions
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 6))
+    ax1, ax2 = new_plot((12, 6), ncols=2)
     
     # TextBlob sentiment distribution
-    sns.barplot(x='textblob_category', y='tweet_count', data=textblob_dist, ax=ax1)
+    ax1.bar(textblob_dist['textblob_category'], textblob_dist['tweet_count'])
     ax1.set_title('TextBlob Sentiment Distribution')
     ax1.set_xlabel('Sentiment Category')
     ax1.set_ylabel('Tweet Count')
     
     # VADER sentiment distribution
-    sns.barplot(x='vader_category', y='tweet_count', data=vader_dist, ax=ax2)
+    ax2.bar(vader_dist['vader_category'], vader_dist['tweet_count'])
     ax2.set_title('VADER Sentiment Distribution')
     ax2.set_xlabel('Sentiment Category')
     ax2.set_ylabel('Tweet Count')
     
-    plt.tight_layout()
+    FIG.tight_layout()
     
     # Save plot
     plot_path = os.path.join(RESULTS_DIR, 'sentiment_distribution.png')
-    plt.savefig(plot_path)
-    plt.close()
+    save_plot(plot_path)
     
     print(f"Sentiment distribution plot saved to {plot_path}")
     
@@ -95,20 +153,19 @@ def analyze_sentiment_distribution(conn):
     agreement = pd.read_sql_query(agreement_query, conn)
     
     # Plot agreement
-    plt.figure(figsize=(8, 6))
-    sns.barplot(x='agreement', y='count', data=agreement)
-    plt.title('Agreement Between TextBlob and VADER Sentiment Analysis')
-    plt.xlabel('Agreement')
-    plt.ylabel('Count')
+    ax = new_plot((8, 6))
+    ax.bar(agreement['agreement'], agreement['count'])
+    ax.set_title('Agreement Between TextBlob and VADER Sentiment Analysis')
+    ax.set_xlabel('Agreement')
+    ax.set_ylabel('Count')
     
     # Save plot
     agreement_path = os.path.join(RESULTS_DIR, 'sentiment_agreement.png')
-    plt.savefig(agreement_path)
-    plt.close()
+    save_plot(agreement_path)
     
     print(f"Sentiment agreement plot saved to {agreement_path}")
     
-    return sentiment_dist
+    return textblob_dist, vader_dist
 
 def analyze_mental_health_terms(conn):
     """
@@ -132,22 +189,95 @@ def analyze_mental_health_terms(conn):
     terms_freq = pd.read_sql_query(query, conn)
     
     # Plot top 10 terms
-    plt.figure(figsize=(10, 6))
+    ax = new_plot((10, 6))
     top_terms = terms_freq.head(10)
-    sns.barplot(x='occurrence_count', y='term_text', data=top_terms)
-    plt.title('Top 10 Mental Health Terms')
-    plt.xlabel('Occurrence Count')
-    plt.ylabel('Term')
+    ax.barh(top_terms['term_text'], top_terms['occurrence_count'])
+    ax.invert_yaxis()
+    ax.set_title('Top 10 Mental Health Terms')
+    ax.set_xlabel('Occurrence Count')
+    ax.set_ylabel('Term')
     
     # Save plot
     plot_path = os.path.join(RESULTS_DIR, 'mental_health_terms.png')
-    plt.savefig(plot_path)
-    plt.close()
+    save_plot(plot_path)
     
     print(f"Mental health terms plot saved to {plot_path}")
     
     return terms_freq
 
+def parse_term_json(value):
+    """
+    Parse a stored mental_health_terms JSON list
+    
+    Args:
+        value: JSON text, or a missing value
+        
+    Returns:
+        list: Mental health terms, empty for missing or malformed values
+    """
+    if not isinstance(value, (str, bytes)):
+        return []
+        
+    try:
+        terms = orjson.loads(value)
+    except orjson.JSONDecodeError:
+        return []
+        
+    return terms if isinstance(terms, list) else []
+
+def load_term_sentiment_fallback(conn):
+    """
+    Aggregate sentiment by mental health term in pandas
+    
+    Used when SQLite is built without the JSON1 extension.
+    
+    Args:
+        conn (sqlite3.Connection): Database connection
+        
+    Returns:
+        pd.DataFrame: Average sentiment and tweet count per term
+    """
+    query = TWEET_FULL_CTE + """
+    SELECT mental_health_terms, textblob_polarity, vader_compound
+    FROM tweet_full
+    WHERE contains_mental_health_term = 1
+    """
+    
+    # Running [polarity sum, polarity count, compound sum, compound count,
+    # tweet count] per term; NULL scores are skipped as AVG does
+    totals = defaultdict(lambda: [0.0, 0, 0.0, 0, 0])
+    
+    for chunk in pd.read_sql_query(query, conn, chunksize=SQL_CHUNK_SIZE):
+        # Parse the chunk's term lists up front so the loop only walks lists
+        term_lists = chunk['mental_health_terms'].map(parse_term_json)
+        
+        for term_list, pol, vad in zip(term_lists.to_numpy(),
+                                       chunk['textblob_polarity'].to_numpy(dtype=np.float64),
+                                       chunk['vader_compound'].to_numpy(dtype=np.float64)):
+            pol_ok = not np.isnan(pol)
+            vad_ok = not np.isnan(vad)
+            
+            for term in term_list:
+                acc = totals[term]
+                if pol_ok:
+                    acc[0] += pol
+                    acc[1] += 1
+                if vad_ok:
+                    acc[2] += vad
+                    acc[3] += 1
+                acc[4] += 1
+                
+    terms = list(totals)
+    sums = np.array(list(totals.values()), dtype=np.float64).reshape(-1, 5)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return pd.DataFrame({
+            'term': terms,
+            'textblob_polarity': sums[:, 0] / sums[:, 1],
+            'vader_compound': sums[:, 2] / sums[:, 3],
+            'count': sums[:, 4].astype(np.int64)
+        })
+
 def analyze_sentiment_by_term(conn):
     """
     Analyze sentiment distribution by mental health term
@@ -160,54 +290,31 @@ def analyze_sentiment_by_term(conn):
     """
     print("Analyzing sentiment by mental health term...")
     
-    # This query is complex because mental_health_terms is stored as JSON
-    # We'll use Python to process this instead
-    
-    # Get tweets with sentiment and mental health terms
-    query = """
+    # Expand the JSON term lists with json_each and aggregate inside SQLite
+    query = TWEET_FULL_CTE + """
     SELECT 
-        t.tweet_id,
-        t.cleaned_text,
-        s.textblob_polarity,
-        s.vader_compound,
-        s.mental_health_terms
-    FROM tweets t
-    JOIN tweet_sentiment s ON t.tweet_id = s.tweet_id
-    WHERE s.contains_mental_health_term = 1
+        j.value AS term,
+        AVG(v.textblob_polarity) AS textblob_polarity,
+        AVG(v.vader_compound) AS vader_compound,
+        COUNT(*) AS count
+    FROM tweet_full v, json_each(v.mental_health_terms) j
+    WHERE v.contains_mental_health_term = 1
+      AND json_valid(v.mental_health_terms)
+    GROUP BY j.value
     """
     
-    tweets_df = pd.read_sql_query(query, conn)
-    
-    # Process mental health terms
-    term_sentiment = []
-    
-    for _, row in tweets_df.iterrows():
-        try:
-            terms = json.loads(row['mental_health_terms'])
-            for term in terms:
-                term_sentiment.append({
-                    'term': term,
-                    'textblob_polarity': row['textblob_polarity'],
-                    'vader_compound': row['vader_compound']
-                })
-        except:
-            continue
+    try:
+        term_sentiment_df = pd.read_sql_query(query, conn)
+    except pd.errors.DatabaseError:
+        # SQLite without JSON1 has no json_each/json_valid
+        term_sentiment_df = load_term_sentiment_fallback(conn)
     
-    if not term_sentiment:
+    if term_sentiment_df.empty:
         print("No mental health terms found in tweets")
         return None
         
-    term_sentiment_df = pd.DataFrame(term_sentiment)
-    
-    # Calculate average sentiment by term
-    term_avg_sentiment = term_sentiment_df.groupby('term').agg({
-        'textblob_polarity': 'mean',
-        'vader_compound': 'mean',
-        'term': 'count'
-    }).rename(columns={'term': 'count'}).reset_index()
-    
     # Filter to terms with at least 5 occurrences
-    term_avg_sentiment = term_avg_sentiment[term_avg_sentiment['count'] >= 5]
+    term_avg_sentiment = term_sentiment_df[term_sentiment_df['count'] >= 5]
     
     if term_avg_sentiment.empty:
         print("Not enough data to analyze sentiment by term")
@@ -217,44 +324,151 @@ def analyze_sentiment_by_term(conn):
     term_avg_sentiment = term_avg_sentiment.sort_values('textblob_polarity')
     
     # Plot sentiment by term
-    plt.figure(figsize=(12, 8))
+    ax = new_plot((12, 8))
     
     # Create a horizontal bar chart
-    sns.barplot(x='textblob_polarity', y='term', data=term_avg_sentiment)
-    plt.title('Average Sentiment by Mental Health Term (TextBlob)')
-    plt.xlabel('Average Sentiment Polarity')
-    plt.ylabel('Mental Health Term')
-    plt.axvline(x=0, color='gray', linestyle='--')
+    ax.barh(term_avg_sentiment['term'], term_avg_sentiment['textblob_polarity'])
+    ax.invert_yaxis()
+    ax.set_title('Average Sentiment by Mental Health Term (TextBlob)')
+    ax.set_xlabel('Average Sentiment Polarity')
+    ax.set_ylabel('Mental Health Term')
+    ax.axvline(x=0, color='gray', linestyle='--')
     
     # Save plot
     plot_path = os.path.join(RESULTS_DIR, 'sentiment_by_term_textblob.png')
-    plt.savefig(plot_path)
-    plt.close()
+    save_plot(plot_path)
     
     print(f"Sentiment by term plot (TextBlob) saved to {plot_path}")
     
     # Plot for VADER sentiment
-    plt.figure(figsize=(12, 8))
+    ax = new_plot((12, 8))
     
     # Sort by VADER compound
     term_avg_sentiment = term_avg_sentiment.sort_values('vader_compound')
     
     # Create a horizontal bar chart
-    sns.barplot(x='vader_compound', y='term', data=term_avg_sentiment)
-    plt.title('Average Sentiment by Mental Health Term (VADER)')
-    plt.xlabel('Average Sentiment Compound Score')
-    plt.ylabel('Mental Health Term')
-    plt.axvline(x=0, color='gray', linestyle='--')
+    ax.barh(term_avg_sentiment['term'], term_avg_sentiment['vader_compound'])
+    ax.invert_yaxis()
+    ax.set_title('Average Sentiment by Mental Health Term (VADER)')
+    ax.set_xlabel('Average Sentiment Compound Score')
+    ax.set_ylabel('Mental Health Term')
+    ax.axvline(x=0, color='gray', linestyle='--')
     
     # Save plot
     plot_path = os.path.join(RESULTS_DIR, 'sentiment_by_term_vader.png')
-    plt.savefig(plot_path)
-    plt.close()
+    save_plot(plot_path)
     
     print(f"Sentiment by term plot (VADER) saved to {plot_path}")
     
     return term_avg_sentiment
 
+@njit(cache=True, error_model='numpy')
+def _user_stats_kernel(mh_count, tweet_count, polarity, engagement):
+    """
+    Compute the mental health percentage, means and correlations in one pass
+    
+    NaNs are skipped in the means and pairwise in the correlations, as in pandas.
+    
+    Args:
+        mh_count (np.ndarray): Mental health tweet count per user
+        tweet_count (np.ndarray): Tweet count per user
+        polarity (np.ndarray): Average TextBlob polarity per user
+        engagement (np.ndarray): Average engagement per user
+        
+    Returns:
+        tuple: Percentage array, mean percentage, mean polarity, mean engagement,
+            percentage/polarity correlation, engagement/polarity correlation
+    """
+    n = mh_count.shape[0]
+    pct = np.empty(n)
+    
+    sum_pct = sum_pol = sum_eng = 0.0
+    n_pct = n_pol = n_eng = 0
+    
+    # Pairwise sums for each correlation
+    n_a = 0
+    sx_a = sy_a = sxy_a = sxx_a = syy_a = 0.0
+    n_b = 0
+    sx_b = sy_b = sxy_b = sxx_b = syy_b = 0.0
+    
+    for i in range(n):
+        x = mh_count[i] / tweet_count[i] * 100.0
+        pct[i] = x
+        y = polarity[i]
+        e = engagement[i]
+        
+        x_ok = not np.isnan(x)
+        y_ok = not np.isnan(y)
+        e_ok = not np.isnan(e)
+        
+        if x_ok:
+            sum_pct += x
+            n_pct += 1
+        if y_ok:
+            sum_pol += y
+            n_pol += 1
+        if e_ok:
+            sum_eng += e
+            n_eng += 1
+            
+        if x_ok and y_ok:
+            n_a += 1
+            sx_a += x
+            sy_a += y
+            sxy_a += x * y
+            sxx_a += x * x
+            syy_a += y * y
+            
+        if e_ok and y_ok:
+            n_b += 1
+            sx_b += e
+            sy_b += y
+            sxy_b += e * y
+            sxx_b += e * e
+            syy_b += y * y
+            
+    mean_pct = sum_pct / n_pct if n_pct > 0 else np.nan
+    mean_pol = sum_pol / n_pol if n_pol > 0 else np.nan
+    mean_eng = sum_eng / n_eng if n_eng > 0 else np.nan
+    
+    corr_a = np.nan
+    denom_a = (n_a * sxx_a - sx_a * sx_a) * (n_a * syy_a - sy_a * sy_a)
+    if n_a > 1 and denom_a > 0:
+        corr_a = (n_a * sxy_a - sx_a * sy_a) / np.sqrt(denom_a)
+        
+    corr_b = np.nan
+    denom_b = (n_b * sxx_b - sx_b * sx_b) * (n_b * syy_b - sy_b * sy_b)
+    if n_b > 1 and denom_b > 0:
+        corr_b = (n_b * sxy_b - sx_b * sy_b) / np.sqrt(denom_b)
+        
+    return pct, mean_pct, mean_pol, mean_eng, corr_a, corr_b
+
+def compute_user_stats(user_metrics):
+    """
+    Compute per-user mental health percentage and summary statistics
+    
+    Args:
+        user_metrics (pd.DataFrame): User metrics data
+        
+    Returns:
+        dict: Percentage array, averages, and correlations with polarity
+    """
+    pct, mean_pct, mean_pol, mean_eng, corr_pct, corr_eng = _user_stats_kernel(
+        user_metrics['mental_health_tweet_count'].to_numpy(dtype=np.float64),
+        user_metrics['tweet_count'].to_numpy(dtype=np.float64),
+        user_metrics['avg_textblob_polarity'].to_numpy(dtype=np.float64),
+        user_metrics['avg_engagement'].to_numpy(dtype=np.float64)
+    )
+    
+    return {
+        'mental_health_percentage': pct,
+        'avg_mental_health_percentage': mean_pct,
+        'avg_textblob_polarity': mean_pol,
+        'avg_engagement': mean_eng,
+        'corr_percentage_polarity': corr_pct,
+        'corr_engagement_polarity': corr_eng
+    }
+
 def analyze_user_metrics(conn):
     """
     Analyze user metrics related to mental health tweets
@@ -263,7 +477,8 @@ def analyze_user_metrics(conn):
         conn (sqlite3.Connection): Database connection
         
     Returns:
-        pd.DataFrame: User metrics data
+        tuple: User metrics data and the summary statistics from
+            compute_user_stats
     """
     print("Analyzing user metrics...")
     
@@ -278,65 +493,66 @@ def analyze_user_metrics(conn):
     
     if user_metrics.empty:
         print("No user metrics data available")
-        return None
+        return None, None
     
-    # Calculate percentage of mental health tweets
-    user_metrics['mental_health_percentage'] = (user_metrics['mental_health_tweet_count'] / 
-                                              user_metrics['tweet_count']) * 100
+    # Calculate percentage of mental health tweets along with the report statistics
+    user_stats = compute_user_stats(user_metrics)
+    user_metrics['mental_health_percentage'] = user_stats['mental_health_percentage']
     
     # Plot distribution of mental health tweet percentage
-    plt.figure(figsize=(10, 6))
-    sns.histplot(user_metrics['mental_health_percentage'], bins=20)
-    plt.title('Distribution of Mental Health Tweet Percentage by User')
-    plt.xlabel('Percentage of Tweets Related to Mental Health')
-    plt.ylabel('Number of Users')
+    pct = user_metrics['mental_health_percentage'].to_numpy()
+    counts, edges = np.histogram(pct[~np.isnan(pct)], bins=20)
+    
+    ax = new_plot((10, 6))
+    ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge')
+    ax.set_title('Distribution of Mental Health Tweet Percentage by User')
+    ax.set_xlabel('Percentage of Tweets Related to Mental Health')
+    ax.set_ylabel('Number of Users')
     
     # Save plot
     plot_path = os.path.join(RESULTS_DIR, 'mental_health_tweet_percentage.png')
-    plt.savefig(plot_path)
-    plt.close()
+    save_plot(plot_path)
     
     print(f"Mental health tweet percentage plot saved to {plot_path}")
     
     # Plot correlation between mental health tweet percentage and sentiment
-    plt.figure(figsize=(10, 6))
-    sns.scatterplot(x='mental_health_percentage', y='avg_textblob_polarity', data=user_metrics)
-    plt.title('Mental Health Tweet Percentage vs. Average Sentiment')
-    plt.xlabel('Percentage of Tweets Related to Mental Health')
-    plt.ylabel('Average Sentiment Polarity (TextBlob)')
+    ax = new_plot((10, 6))
+    ax.scatter(pct, user_metrics['avg_textblob_polarity'].to_numpy(), s=4, alpha=0.3)
+    ax.set_title('Mental Health Tweet Percentage vs. Average Sentiment')
+    ax.set_xlabel('Percentage of Tweets Related to Mental Health')
+    ax.set_ylabel('Average Sentiment Polarity (TextBlob)')
     
     # Save plot
     plot_path = os.path.join(RESULTS_DIR, 'mental_health_vs_sentiment.png')
-    plt.savefig(plot_path)
-    plt.close()
+    save_plot(plot_path)
     
     print(f"Mental health vs sentiment plot saved to {plot_path}")
     
     # Plot correlation between engagement and sentiment
-    plt.figure(figsize=(10, 6))
-    sns.scatterplot(x='avg_engagement', y='avg_textblob_polarity', data=user_metrics)
-    plt.title('Average Engagement vs. Average Sentiment')
-    plt.xlabel('Average Engagement')
-    plt.ylabel('Average Sentiment Polarity (TextBlob)')
+    ax = new_plot((10, 6))
+    ax.scatter(user_metrics['avg_engagement'].to_numpy(), user_metrics['avg_textblob_polarity'].to_numpy(),
+               s=4, alpha=0.3)
+    ax.set_title('Average Engagement vs. Average Sentiment')
+    ax.set_xlabel('Average Engagement')
+    ax.set_ylabel('Average Sentiment Polarity (TextBlob)')
     
     # Save plot
     plot_path = os.path.join(RESULTS_DIR, 'engagement_vs_sentiment.png')
-    plt.savefig(plot_path)
-    plt.close()
+    save_plot(plot_path)
     
     print(f"Engagement vs sentiment plot saved to {plot_path}")
     
-    return user_metrics
+    return user_metrics, user_stats
 
-def generate_summary_report(sentiment_dist, terms_freq, term_sentiment, user_metrics):
+def generate_summary_report(sentiment_dists, terms_freq, term_sentiment, user_stats):
     """
     Generate a summary report of the analysis
     
     Args:
-        sentiment_dist (pd.DataFrame): Sentiment distribution data
+        sentiment_dists (tuple): TextBlob and VADER sentiment distribution data
         terms_freq (pd.DataFrame): Mental health terms frequency data
         term_sentiment (pd.DataFrame): Sentiment by term data
-        user_metrics (pd.DataFrame): User metrics data
+        user_stats (dict): User metric statistics from analyze_user_metrics
         
     Returns:
         str: Summary report
@@ -349,9 +565,8 @@ def generate_summary_report(sentiment_dist, terms_freq, term_sentiment, user_met
     # Sentiment distribution summary
     report += "## Sentiment Distribution\n\n"
     
-    if sentiment_dist is not None:
-        textblob_dist = sentiment_dist.groupby('textblob_category').agg({'tweet_count': 'sum'}).reset_index()
-        vader_dist = sentiment_dist.groupby('vader_category').agg({'tweet_count': 'sum'}).reset_index()
+    if sentiment_dists is not None:
+        textblob_dist, vader_dist = sentiment_dists
         
         report += "### TextBlob Sentiment\n\n"
         report += textblob_dist.to_markdown() + "\n\n"
@@ -382,11 +597,11 @@ def generate_summary_report(sentiment_dist, terms_freq, term_sentiment, user_met
     # User metrics summary
     report += "## User Metrics\n\n"
     
-    if user_metrics is not None and not user_metrics.empty:
+    if user_stats is not None:
         # Calculate summary statistics
-        avg_mental_health_pct = user_metrics['mental_health_percentage'].mean()
-        avg_sentiment = user_metrics['avg_textblob_polarity'].mean()
-        avg_engagement = user_metrics['avg_engagement'].mean()
+        avg_mental_health_pct = user_stats['avg_mental_health_percentage']
+        avg_sentiment = user_stats['avg_textblob_polarity']
+        avg_engagement = user_stats['avg_engagement']
         
         report += f"Average percentage of mental health tweets per user: {avg_mental_health_pct:.2f}%\n\n"
         report += f"Average sentiment polarity: {avg_sentiment:.4f}\n\n"
@@ -400,8 +615,7 @@ def generate_summary_report(sentiment_dist, terms_freq, term_sentiment, user_met
     # Add key findings based on available data
     findings = []
     
-    if sentiment_dist is not None:
-        textblob_dist = sentiment_dist.groupby('textblob_category').agg({'tweet_count': 'sum'}).reset_index()
+    if sentiment_dists is not None:
         most_common = textblob_dist.loc[textblob_dist['tweet_count'].idxmax()]
         findings.append(f"The most common sentiment in mental health tweets is {most_common['textblob_category']}.")
     
@@ -415,15 +629,15 @@ def generate_summary_report(sentiment_dist, terms_freq, term_sentiment, user_met
         findings.append(f"The mental health term with the most positive sentiment is '{most_positive['term']}' (polarity: {most_positive['textblob_polarity']:.4f}).")
         findings.append(f"The mental health term with the most negative sentiment is '{most_negative['term']}' (polarity: {most_negative['textblob_polarity']:.4f}).")
     
-    if user_metrics is not None and not user_metrics.empty:
+    if user_stats is not None:
         # Check correlation between mental health tweet percentage and sentiment
-        corr = user_metrics['mental_health_percentage'].corr(user_metrics['avg_textblob_polarity'])
+        corr = user_stats['corr_percentage_polarity']
         if abs(corr) > 0.3:
             direction = "positive" if corr > 0 else "negative"
             findings.append(f"There is a {direction} correlation ({corr:.4f}) between the percentage of mental health tweets and sentiment polarity.")
         
         # Check correlation between engagement and sentiment
-        corr = user_metrics['avg_engagement'].corr(user_metrics['avg_textblob_polarity'])
+        corr = user_stats['corr_engagement_polarity']
         if abs(corr) > 0.3:
             direction = "positive" if corr > 0 else "negative"
             findings.append(f"There is a {direction} correlation ({corr:.4f}) between engagement and sentiment polarity.")
@@ -452,13 +666,13 @@ def main():
         conn = connect_to_database()
         
         # Perform analyses
-        sentiment_dist = analyze_sentiment_distribution(conn)
+        sentiment_dists = analyze_sentiment_distribution(conn)
         terms_freq = analyze_mental_health_terms(conn)
         term_sentiment = analyze_sentiment_by_term(conn)
-        user_metrics = analyze_user_metrics(conn)
+        user_metrics, user_stats = analyze_user_metrics(conn)
         
         # Generate summary report
-        generate_summary_report(sentiment_dist, terms_freq, term_sentiment, user_metrics)
+        generate_summary_report(sentiment_dists, terms_freq, term_sentiment, user_stats)
         
         # Close connection
         conn.close()
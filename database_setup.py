@@ -6,7 +6,13 @@ This script creates the database structure and imports processed data.
 import os
 import sqlite3
 import pandas as pd
+import numpy as np
+import pyarrow.parquet as pq
 import json
+import orjson
+import ast
+from itertools import chain
+from collections import Counter
 from datetime import datetime
 
 # Paths
@@ -15,6 +21,154 @@ DATA_DIR = os.path.join(BASE_DIR, 'data')
 PROCESSED_DIR = os.path.join(DATA_DIR, 'processed')
 DB_PATH = os.path.join(DATA_DIR, 'social_media_mental_health.db')
 
+# Rows read from a processed file at a time
+IMPORT_CHUNK_SIZE = 50_000
+
+# Narrow column types for processed CSVs; sentiment scores stay float64 to
+# match the REAL columns they are stored in
+CSV_DTYPES = {
+    'id': 'string',
+    'tweet_id': 'string',
+    'retweet_count': 'Int32',
+    'favorite_count': 'Int32',
+    'contains_mental_health_term': 'boolean',
+    'textblob_category': 'category',
+    'vader_category': 'category'
+}
+
+# Defaults for required columns missing from a processed CSV; callables
+# receive the chunk
+COLUMN_DEFAULTS = {
+    'tweet_id': lambda df: df.index.astype(str),
+    'text': '',
+    'cleaned_text': '',
+    'created_at': lambda df: datetime.now().isoformat(),
+    'collected_at': lambda df: datetime.now().isoformat(),
+    'search_keyword': 'unknown',
+    'textblob_polarity': 0.0,
+    'textblob_subjectivity': 0.0,
+    'textblob_category': 'neutral',
+    'vader_compound': 0.0,
+    'vader_positive': 0.0,
+    'vader_negative': 0.0,
+    'vader_neutral': 0.0,
+    'vader_category': 'neutral',
+    'mental_health_terms': '[]',
+    'contains_mental_health_term': 0
+}
+
+# Username field inside a JSON or Python repr of the user object
+USERNAME_PATTERN = r"""["']username["']\s*:\s*["']([^"']*)["']"""
+
+# Database version recorded in PRAGMA user_version; 1 marks created_at as
+# migrated to DB_DATE_FORMAT
+SCHEMA_VERSION = 1
+
+# Timestamp formats
+TWITTER_DATE_FORMAT = '%a %b %d %H:%M:%S %z %Y'
+DB_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+def normalize_timestamps(values):
+    """
+    Convert timestamps to ISO-8601 text so SQLite date functions can use them
+    
+    Args:
+        values (pd.Series): Timestamps in Twitter API or ISO-8601 format
+        
+    Returns:
+        pd.Series: Timestamps formatted as DB_DATE_FORMAT in UTC, with
+            unparseable values left unchanged
+    """
+    parsed = pd.to_datetime(values, format=TWITTER_DATE_FORMAT, errors='coerce', utc=True, cache=True)
+    iso_parsed = pd.to_datetime(values, format='ISO8601', errors='coerce', utc=True, cache=True)
+    parsed = parsed.fillna(iso_parsed)
+    
+    return parsed.dt.strftime(DB_DATE_FORMAT).fillna(values)
+
+def parse_term_list(value):
+    """
+    Parse a mental health term list read from a processed file
+    
+    Parquet files store native lists. CSVs store the lists as JSON; older
+    CSVs hold Python list reprs, which are parsed with ast.literal_eval.
+    
+    Args:
+        value: List or array, JSON or Python representation of a list, or missing value
+        
+    Returns:
+        list: Mental health terms
+    """
+    if isinstance(value, list):
+        return value
+        
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+        
+    if isinstance(value, str) and value.startswith('['):
+        try:
+            return orjson.loads(value)
+        except ValueError:
+            pass
+            
+        try:
+            return ast.literal_eval(value)
+        except (ValueError, SyntaxError):
+            return []
+            
+    return []
+
+def extract_usernames(users):
+    """
+    Extract usernames from a column of user objects
+    
+    Args:
+        users (pd.Series): User dicts, or their JSON/string representations
+        
+    Returns:
+        pd.Series: Usernames, empty where unavailable
+    """
+    if not users.empty and isinstance(users.iloc[0], dict):
+        return pd.Series(
+            [x.get('username', '') if isinstance(x, dict) else '' for x in users],
+            index=users.index
+        )
+        
+    return users.astype('string').str.extract(USERNAME_PATTERN, expand=False).fillna('')
+
+def normalize_stored_timestamps(conn):
+    """
+    Rewrite created_at values that SQLite date functions cannot parse
+    
+    Databases imported before timestamps were normalized hold raw Twitter
+    timestamps, and INSERT OR IGNORE never rewrites those rows. Run once by
+    create_database; this is the only place legacy timestamps are handled.
+    
+    Args:
+        conn (sqlite3.Connection): Database connection
+        
+    Returns:
+        int: Number of rows updated
+    """
+    stale = pd.read_sql_query('''
+    SELECT tweet_id, created_at
+    FROM tweets
+    WHERE created_at IS NOT NULL AND DATE(created_at) IS NULL
+    ''', conn)
+    
+    if stale.empty:
+        return 0
+        
+    stale['normalized'] = normalize_timestamps(stale['created_at'])
+    stale = stale[stale['normalized'] != stale['created_at']]
+    
+    with conn:
+        conn.executemany(
+            'UPDATE tweets SET created_at = ? WHERE tweet_id = ?',
+            stale[['normalized', 'tweet_id']].itertuples(index=False, name=None)
+        )
+        
+    return len(stale)
+
 def create_database():
     """
     Create SQLite database with tables for tweets, sentiment, and user metrics
@@ -26,225 +180,321 @@ def create_database():
     
     # Connect to database (creates it if it doesn't exist)
     conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
     
-    # Create tweets table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS tweets (
-        tweet_id TEXT PRIMARY KEY,
-        tweet_text TEXT,
-        cleaned_text TEXT,
-        created_at TEXT,
-        collected_at TEXT,
-        search_keyword TEXT,
-        username TEXT,
-        retweet_count INTEGER,
-        favorite_count INTEGER
-    )
-    ''')
-    
-    # Create tweet_sentiment table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS tweet_sentiment (
-        tweet_id TEXT PRIMARY KEY,
-        textblob_polarity REAL,
-        textblob_subjectivity REAL,
-        textblob_category TEXT,
-        vader_compound REAL,
-        vader_positive REAL,
-        vader_negative REAL,
-        vader_neutral REAL,
-        vader_category TEXT,
-        contains_mental_health_term INTEGER,
-        mental_health_terms TEXT,
-        FOREIGN KEY (tweet_id) REFERENCES tweets (tweet_id)
-    )
-    ''')
-    
-    # Create user_metrics table (aggregated, anonymized)
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS user_metrics (
-        username TEXT PRIMARY KEY,
-        tweet_count INTEGER,
-        avg_textblob_polarity REAL,
-        avg_vader_compound REAL,
-        mental_health_tweet_count INTEGER,
-        avg_engagement REAL
-    )
-    ''')
-    
-    # Create mental_health_terms table
-    cursor.execute('''
-    CREATE TABLE IF NOT EXISTS mental_health_terms (
-        term_id INTEGER PRIMARY KEY AUTOINCREMENT,
-        term_text TEXT UNIQUE,
-        category TEXT,
-        occurrence_count INTEGER DEFAULT 0
-    )
-    ''')
-    
-    # Commit changes and return connection
-    conn.commit()
+    # Fewer fsyncs per transaction during bulk imports
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    
+    # Create the schema in one transaction
+    with conn:
+        cursor = conn.cursor()
+        
+        # Create tweets table
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS tweets (
+            tweet_id TEXT PRIMARY KEY,
+            tweet_text TEXT,
+            cleaned_text TEXT,
+            created_at TEXT,
+            collected_at TEXT,
+            search_keyword TEXT,
+            username TEXT,
+            retweet_count INTEGER,
+            favorite_count INTEGER
+        )
+        ''')
+        
+        # Create tweet_sentiment table
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS tweet_sentiment (
+            tweet_id TEXT PRIMARY KEY,
+            textblob_polarity REAL,
+            textblob_subjectivity REAL,
+            textblob_category TEXT,
+            vader_compound REAL,
+            vader_positive REAL,
+            vader_negative REAL,
+            vader_neutral REAL,
+            vader_category TEXT,
+            contains_mental_health_term INTEGER,
+            mental_health_terms TEXT,
+            FOREIGN KEY (tweet_id) REFERENCES tweets (tweet_id)
+        )
+        ''')
+        
+        # Create user_metrics table (aggregated, anonymized)
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_metrics (
+            username TEXT PRIMARY KEY,
+            tweet_count INTEGER,
+            avg_textblob_polarity REAL,
+            avg_vader_compound REAL,
+            mental_health_tweet_count INTEGER,
+            avg_engagement REAL
+        )
+        ''')
+        
+        # Create mental_health_terms table
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS mental_health_terms (
+            term_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            term_text TEXT UNIQUE,
+            category TEXT,
+            occurrence_count INTEGER DEFAULT 0
+        )
+        ''')
+        
+        # The analyzer joins tweets and sentiment itself; drop the unused view
+        # left by earlier versions
+        cursor.execute('DROP VIEW IF EXISTS v_tweet_full')
+        
+        # Create indexes for analysis queries
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_tweets_username
+        ON tweets (username)
+        ''')
+        
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_sentiment_cats
+        ON tweet_sentiment (textblob_category, vader_category)
+        ''')
+        
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_sentiment_mh
+        ON tweet_sentiment (contains_mental_health_term)
+        ''')
+    
+    # One-time migration for tweets imported with raw Twitter timestamps;
+    # imports normalize created_at themselves from then on
+    if conn.execute('PRAGMA user_version').fetchone()[0] < SCHEMA_VERSION:
+        migrated = normalize_stored_timestamps(conn)
+        if migrated:
+            print(f"Normalized created_at for {migrated} existing tweets")
+        conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+    
     return conn
 
-def import_processed_data(conn, csv_file):
+def _sql_rows(df, columns):
+    """
+    Yield rows of plain Python values for sqlite3 parameter binding
+    
+    Args:
+        df (pd.DataFrame): Source data
+        columns (list): Columns to emit, in parameter order
+        
+    Returns:
+        iterator: Row tuples with missing values as None
+    """
+    values = df[columns].astype(object)
+    return values.where(values.notna(), None).itertuples(index=False, name=None)
+
+def _process_chunk(df, conn):
     """
-    Import processed data from CSV file into database
+    Normalize one chunk of processed tweets and append it to the database
+    
+    Tweets already in the database are skipped.
     
     Args:
+        df (pd.DataFrame): Chunk of processed tweets
         conn (sqlite3.Connection): Database connection
-        csv_file (str): Path to CSV file
+        
+    Returns:
+        int: Number of new tweets imported
+    """
+    # Clean up data for import
+    if 'id' in df.columns:
+        df.rename(columns={'id': 'tweet_id'}, inplace=True)
+        
+    # Handle missing columns
+    for col, default in COLUMN_DEFAULTS.items():
+        if col not in df.columns:
+            df[col] = default(df) if callable(default) else default
+    
+    # Store created_at in a single sortable format
+    df['created_at'] = normalize_timestamps(df['created_at'])
+    
+    # Store mental_health_terms as JSON
+    df['mental_health_terms'] = df['mental_health_terms'].map(parse_term_list).map(json.dumps)
+    
+    # Extract username from user column if available
+    if 'user' in df.columns and 'username' not in df.columns:
+        df['username'] = extract_usernames(df['user'])
+    
+    # Add engagement metrics if not available
+    for col in ['retweet_count', 'favorite_count']:
+        if col not in df.columns:
+            df[col] = 0
+    
+    cursor = conn.cursor()
+    
+    # Import tweets
+    cursor.executemany('''
+    INSERT OR IGNORE INTO tweets (tweet_id, tweet_text, cleaned_text, created_at,
+                                  collected_at, search_keyword, username,
+                                  retweet_count, favorite_count)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', _sql_rows(df, ['tweet_id', 'text', 'cleaned_text', 'created_at', 
+                        'collected_at', 'search_keyword', 'username',
+                        'retweet_count', 'favorite_count']))
+    imported = cursor.rowcount
+    
+    # Import sentiment data
+    cursor.executemany('''
+    INSERT OR IGNORE INTO tweet_sentiment (tweet_id, textblob_polarity, textblob_subjectivity,
+                                           textblob_category, vader_compound, vader_positive,
+                                           vader_negative, vader_neutral, vader_category,
+                                           contains_mental_health_term, mental_health_terms)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', _sql_rows(df, ['tweet_id', 'textblob_polarity', 'textblob_subjectivity', 
+                        'textblob_category', 'vader_compound', 'vader_positive', 
+                        'vader_negative', 'vader_neutral', 'vader_category', 
+                        'contains_mental_health_term', 'mental_health_terms']))
+    
+    return imported
+
+def read_parquet_chunks(data_file):
+    """
+    Read a processed Parquet file in record batches
+    
+    Args:
+        data_file (str): Path to processed file
+        
+    Yields:
+        pd.DataFrame: Batch indexed by its row position in the file
+    """
+    parquet_file = pq.ParquetFile(data_file)
+    offset = 0
+    
+    for batch in parquet_file.iter_batches(batch_size=IMPORT_CHUNK_SIZE):
+        # Continue the index across batches, as read_csv chunks do, so
+        # fallback tweet IDs stay unique within the file
+        df = batch.to_pandas()
+        df.index = pd.RangeIndex(offset, offset + len(df))
+        offset += len(df)
+        yield df
+
+def read_processed_chunks(data_file):
+    """
+    Read a processed Parquet or CSV file in chunks
+    
+    Args:
+        data_file (str): Path to processed file
+        
+    Returns:
+        iterator: DataFrames of at most IMPORT_CHUNK_SIZE rows, indexed by
+            row position in the file
+    """
+    if data_file.endswith('.parquet'):
+        return read_parquet_chunks(data_file)
+        
+    return pd.read_csv(data_file, chunksize=IMPORT_CHUNK_SIZE, dtype=CSV_DTYPES, engine='c')
+
+def import_processed_data(conn, data_file):
+    """
+    Import processed data from a Parquet or CSV file into database
+    
+    Args:
+        conn (sqlite3.Connection): Database connection
+        data_file (str): Path to processed file
         
     Returns:
         int: Number of records imported
     """
-    print(f"Importing data from {csv_file}")
+    print(f"Importing data from {data_file}")
     
     try:
-        # Read CSV file
-        df = pd.read_csv(csv_file)
+        total_rows = 0
         
-        # Clean up data for import
-        if 'id' in df.columns:
-            df.rename(columns={'id': 'tweet_id'}, inplace=True)
-            
-        # Handle missing columns
-        required_columns = ['tweet_id', 'text', 'cleaned_text', 'created_at', 'collected_at', 
-                           'search_keyword', 'textblob_polarity', 'textblob_subjectivity', 
-                           'textblob_category', 'vader_compound', 'vader_positive', 
-                           'vader_negative', 'vader_neutral', 'vader_category', 
-                           'mental_health_terms', 'contains_mental_health_term']
-                           
-        for col in required_columns:
-            if col not in df.columns:
-                if col == 'tweet_id':
-                    df['tweet_id'] = df.index.astype(str)
-                elif col in ['created_at', 'collected_at']:
-                    df[col] = datetime.now().isoformat()
-                elif col == 'search_keyword':
-                    df[col] = 'unknown'
-                elif col in ['textblob_polarity', 'textblob_subjectivity', 'vader_compound', 
-                            'vader_positive', 'vader_negative', 'vader_neutral']:
-                    df[col] = 0.0
-                elif col in ['textblob_category', 'vader_category']:
-                    df[col] = 'neutral'
-                elif col == 'mental_health_terms':
-                    df[col] = df[col].apply(lambda x: '[]' if pd.isna(x) else x)
-                elif col == 'contains_mental_health_term':
-                    df[col] = 0
-                else:
-                    df[col] = ''
-        
-        # Convert mental_health_terms from string to list if needed
-        if 'mental_health_terms' in df.columns:
-            df['mental_health_terms'] = df['mental_health_terms'].apply(
-                lambda x: json.dumps(x) if isinstance(x, list) else 
-                         (json.dumps(eval(x)) if isinstance(x, str) and x.startswith('[') else json.dumps([]))
-            )
-        
-        # Extract username from user column if available
-        if 'user' in df.columns and 'username' not in df.columns:
-            try:
-                df['username'] = df['user'].apply(
-                    lambda x: x.get('username', '') if isinstance(x, dict) else 
-                             (json.loads(x).get('username', '') if isinstance(x, str) else '')
-                )
-            except:
-                df['username'] = ''
-        
-        # Import tweets
-        tweets_df = df[['tweet_id', 'text', 'cleaned_text', 'created_at', 
-                       'collected_at', 'search_keyword', 'username']].copy()
-                       
-        # Add engagement metrics if available
-        if 'retweet_count' in df.columns:
-            tweets_df['retweet_count'] = df['retweet_count']
-        else:
-            tweets_df['retweet_count'] = 0
-            
-        if 'favorite_count' in df.columns:
-            tweets_df['favorite_count'] = df['favorite_count']
-        else:
-            tweets_df['favorite_count'] = 0
-            
-        tweets_df.to_sql('tweets', conn, if_exists='append', index=False)
+        # Write everything for this file in a single transaction
+        with conn:
+            # Read the file in chunks so it is never fully in memory
+            for chunk in read_processed_chunks(data_file):
+                total_rows += _process_chunk(chunk, conn)
         
-        # Import sentiment data
-        sentiment_df = df[['tweet_id', 'textblob_polarity', 'textblob_subjectivity', 
-                          'textblob_category', 'vader_compound', 'vader_positive', 
-                          'vader_negative', 'vader_neutral', 'vader_category', 
-                          'contains_mental_health_term', 'mental_health_terms']].copy()
-        sentiment_df.to_sql('tweet_sentiment', conn, if_exists='append', index=False)
+        return total_rows
         
-        # Update mental health terms table
-        cursor = conn.cursor()
+    except Exception as e:
+        print(f"Error importing data: {e}")
+        return 0
+
+def rebuild_term_counts(conn):
+    """
+    Recompute the mental_health_terms table from all imported tweets
+    
+    Args:
+        conn (sqlite3.Connection): Database connection
         
-        # Extract all mental health terms
-        all_terms = []
-        for terms_json in df['mental_health_terms']:
-            try:
-                terms = json.loads(terms_json) if isinstance(terms_json, str) else terms_json
-                if isinstance(terms, list):
-                    all_terms.extend(terms)
-            except:
-                pass
-                
-        # Count term occurrences
-        term_counts = {}
-        for term in all_terms:
-            term_counts[term] = term_counts.get(term, 0) + 1
-            
-        # Update mental_health_terms table
-        for term, count in term_counts.items():
-            cursor.execute('''
+    Returns:
+        int: Number of distinct terms
+    """
+    with conn:
+        conn.execute('DELETE FROM mental_health_terms')
+        
+        # Expand the JSON term lists with json_each and count inside SQLite
+        try:
+            cursor = conn.execute('''
             INSERT INTO mental_health_terms (term_text, category, occurrence_count)
-            VALUES (?, ?, ?)
-            ON CONFLICT(term_text) DO UPDATE SET
-            occurrence_count = occurrence_count + ?
-            ''', (term, 'general', count, count))
+            SELECT j.value, 'general', COUNT(*)
+            FROM tweet_sentiment s, json_each(s.mental_health_terms) j
+            WHERE json_valid(s.mental_health_terms)
+            GROUP BY j.value
+            ''')
+            return cursor.rowcount
+        except sqlite3.OperationalError:
+            # SQLite without JSON1 has no json_each/json_valid
+            pass
             
-        # Calculate and import user metrics
-        user_metrics = df.groupby('username').agg({
-            'tweet_id': 'count',
-            'textblob_polarity': 'mean',
-            'vader_compound': 'mean',
-            'contains_mental_health_term': 'sum',
-            'retweet_count': 'mean',
-            'favorite_count': 'mean'
-        }).reset_index()
+        term_counter = Counter(chain.from_iterable(
+            parse_term_list(terms)
+            for (terms,) in conn.execute('SELECT mental_health_terms FROM tweet_sentiment')
+        ))
         
-        user_metrics.rename(columns={
-            'tweet_id': 'tweet_count',
-            'textblob_polarity': 'avg_textblob_polarity',
-            'vader_compound': 'avg_vader_compound',
-            'contains_mental_health_term': 'mental_health_tweet_count'
-        }, inplace=True)
+        conn.executemany('''
+        INSERT INTO mental_health_terms (term_text, category, occurrence_count)
+        VALUES (?, 'general', ?)
+        ''', term_counter.items())
         
-        # Calculate average engagement
-        user_metrics['avg_engagement'] = (user_metrics['retweet_count'] + user_metrics['favorite_count']) / 2
-        
-        # Drop temporary columns
-        user_metrics.drop(['retweet_count', 'favorite_count'], axis=1, inplace=True)
-        
-        # Import user metrics
-        user_metrics.to_sql('user_metrics', conn, if_exists='append', index=False)
+    return len(term_counter)
+
+def rebuild_user_metrics(conn):
+    """
+    Recompute the user_metrics table from all imported tweets
+    
+    Args:
+        conn (sqlite3.Connection): Database connection
         
-        # Commit changes
-        conn.commit()
+    Returns:
+        int: Number of users
+    """
+    with conn:
+        conn.execute('DELETE FROM user_metrics')
         
-        return len(df)
+        # Aggregate inside SQLite over the tweets and sentiment tables
+        cursor = conn.execute('''
+        INSERT INTO user_metrics (username, tweet_count, avg_textblob_polarity,
+                                  avg_vader_compound, mental_health_tweet_count,
+                                  avg_engagement)
+        SELECT 
+            t.username,
+            COUNT(*),
+            AVG(s.textblob_polarity),
+            AVG(s.vader_compound),
+            SUM(s.contains_mental_health_term),
+            (AVG(t.retweet_count) + AVG(t.favorite_count)) / 2
+        FROM tweets t
+        JOIN tweet_sentiment s ON t.tweet_id = s.tweet_id
+        GROUP BY t.username
+        ''')
         
-    except Exception as e:
-        print(f"Error importing data: {e}")
-        return 0
+    return cursor.rowcount
 
 def import_all_processed_data(conn, processed_dir=None):
     """
-    Import all processed CSV files into database
+    Import all processed Parquet and CSV files into database
     
     Args:
         conn (sqlite3.Connection): Database connection
-        processed_dir (str): Directory containing processed CSV files
+        processed_dir (str): Directory containing processed files
         
     Returns:
         int: Total number of records imported
@@ -255,16 +505,17 @@ def import_all_processed_data(conn, processed_dir=None):
     # Create processed directory if it doesn't exist
     os.makedirs(processed_dir, exist_ok=True)
     
-    # Find all processed CSV files
-    csv_files = [f for f in os.listdir(processed_dir) if f.endswith('.csv') and 'processed' in f]
+    # Find all processed files
+    data_files = [f for f in os.listdir(processed_dir)
+                  if f.endswith(('.parquet', '.csv')) and 'processed' in f]
     
-    if not csv_files:
-        print(f"No processed CSV files found in {processed_dir}")
+    if not data_files:
+        print(f"No processed files found in {processed_dir}")
         return 0
         
     total_imported = 0
     
-    for file in csv_files:
+    for file in data_files:
         file_path = os.path.join(processed_dir, file)
         imported = import_processed_data(conn, file_path)
         total_imported += imported
@@ -284,6 +535,15 @@ def main():
     
     print(f"Total records imported: {total_imported}")
     
+    # Aggregate term counts and user metrics once over everything imported
+    term_count = rebuild_term_counts(conn)
+    
+    print(f"Term counts computed for {term_count} mental health terms")
+    
+    user_count = rebuild_user_metrics(conn)
+    
+    print(f"User metrics computed for {user_count} users")
+    
     # Close connection
     conn.close()
     
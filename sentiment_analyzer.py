@@ -4,12 +4,14 @@ This script processes tweets and performs sentiment analysis.
 """
 
 import os
-import json
+import orjson
 import pandas as pd
 import numpy as np
 import re
+import multiprocessing
+from functools import partial
 from datetime import datetime
-from textblob import TextBlob
+from textblob.en.sentiments import PatternAnalyzer
 import nltk
 from nltk.sentiment.vader import SentimentIntensityAnalyzer
 from nltk.tokenize import word_tokenize
@@ -28,105 +30,143 @@ try:
 except:
     print("NLTK resources may not have downloaded properly. Continuing anyway.")
 
-def clean_tweet(tweet):
+# Sentiment labels, stored as a fixed categorical
+SENTIMENT_CATEGORIES = ['negative', 'neutral', 'positive']
+
+# Mental health terms to look for in tweets
+MENTAL_HEALTH_TERMS = (
+    "mental health", "anxiety", "depression", "stress", "therapy", 
+    "self care", "mindfulness", "burnout", "mental wellbeing",
+    "mental illness", "panic attack", "insomnia", "mental wellness"
+)
+
+# The same terms lowercased once, for matching against lowercased text
+MENTAL_HEALTH_TERMS_LOWER = tuple(term.lower() for term in MENTAL_HEALTH_TERMS)
+
+# VADER analyzer shared by all calls (loading the lexicon is expensive)
+VADER_ANALYZER = SentimentIntensityAnalyzer()
+
+# TextBlob's default sentiment analyzer, used without building a TextBlob
+TEXTBLOB_ANALYZER = PatternAnalyzer()
+
+# Load the pattern lexicon now rather than on the first tweet; forked pool
+# workers inherit it and spawned workers load it when importing this module
+TEXTBLOB_ANALYZER.analyze("warmup")
+
+# Tweet cleaning patterns, compiled once
+URL_PATTERN = re.compile(r'http\S+|www\S+|https\S+', re.MULTILINE)
+# User mentions or any non-alphanumeric character (including '#')
+STRIP_PATTERN = re.compile(r'@\w+|[^\w\s]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+def clean_tweets(tweets):
     """
-    Clean tweet text by removing links, special characters, etc.
+    Clean a column of tweet texts with vectorized string operations
+    
+    Removes URLs, user mentions, hashtag symbols and other non-alphanumeric
+    characters, and collapses extra whitespace.
     
     Args:
-        tweet (str): Raw tweet text
+        tweets (pd.Series): Raw tweet texts
         
     Returns:
-        str: Cleaned tweet text
+        pd.Series: Cleaned tweet texts, empty for missing or non-string values
     """
-    if not isinstance(tweet, str):
-        return ""
-        
-    # Remove URLs
-    tweet = re.sub(r'http\S+|www\S+|https\S+', '', tweet, flags=re.MULTILINE)
-    
-    # Remove user mentions
-    tweet = re.sub(r'@\w+', '', tweet)
-    
-    # Remove hashtag symbol but keep the text
-    tweet = re.sub(r'#', '', tweet)
-    
-    # Remove non-alphanumeric characters
-    tweet = re.sub(r'[^\w\s]', '', tweet)
+    # Blank out missing values with one mask instead of per-row checks
+    cleaned = tweets.fillna('')
+    cleaned = cleaned.str.replace(URL_PATTERN, '', regex=True)
+    cleaned = cleaned.str.replace(STRIP_PATTERN, '', regex=True)
+    cleaned = cleaned.str.replace(WHITESPACE_PATTERN, ' ', regex=True).str.strip()
     
-    # Remove extra whitespace
-    tweet = re.sub(r'\s+', ' ', tweet).strip()
-    
-    return tweet
+    # Any remaining non-string values come back from .str as missing
+    return cleaned.fillna('')
 
-def analyze_sentiment_textblob(text):
+def _textblob_scores(text):
     """
-    Analyze sentiment using TextBlob
+    Score text with TextBlob
     
     Args:
         text (str): Text to analyze
         
     Returns:
-        dict: Sentiment scores
+        tuple: Polarity and subjectivity
     """
-    analysis = TextBlob(text)
-    
-    # TextBlob sentiment: polarity (-1 to 1) and subjectivity (0 to 1)
-    return {
-        'polarity': analysis.sentiment.polarity,
-        'subjectivity': analysis.sentiment.subjectivity,
-        'sentiment_category': 'positive' if analysis.sentiment.polarity > 0 else 
-                             ('negative' if analysis.sentiment.polarity < 0 else 'neutral')
-    }
+    return tuple(TEXTBLOB_ANALYZER.analyze(text))
 
-def analyze_sentiment_vader(text):
+def _vader_scores(text):
     """
-    Analyze sentiment using VADER
+    Score text with VADER
     
     Args:
         text (str): Text to analyze
         
     Returns:
-        dict: Sentiment scores
+        tuple: Compound, positive, negative and neutral scores
+    """
+    scores = VADER_ANALYZER.polarity_scores(text)
+    return scores['compound'], scores['pos'], scores['neg'], scores['neu']
+
+def find_mental_health_terms(lowered_texts):
     """
-    analyzer = SentimentIntensityAnalyzer()
-    scores = analyzer.polarity_scores(text)
+    Find MENTAL_HEALTH_TERMS in a column of texts with vectorized substring checks
+    
+    Args:
+        lowered_texts (pd.Series): Lowercased texts to analyze
+        
+    Returns:
+        tuple: List of found terms per text, and boolean array marking texts
+            with at least one term
+    """
+    lowered = lowered_texts.to_numpy(dtype=str)
+    
+    # One C-level substring scan over all texts per term
+    hits = np.stack([np.char.find(lowered, term) >= 0 for term in MENTAL_HEALTH_TERMS_LOWER], axis=1)
+    
+    found_terms = [[term for term, hit in zip(MENTAL_HEALTH_TERMS, row) if hit] for row in hits]
     
-    return {
-        'compound': scores['compound'],
-        'positive': scores['pos'],
-        'negative': scores['neg'],
-        'neutral': scores['neu'],
-        'sentiment_category': 'positive' if scores['compound'] >= 0.05 else 
-                             ('negative' if scores['compound'] <= -0.05 else 'neutral')
-    }
+    return found_terms, hits.any(axis=1)
 
-def extract_mental_health_terms(text, mental_health_terms):
+def normalize_mixed_columns(df):
     """
-    Extract mental health related terms from text
+    Store object columns that mix scalar types (e.g. 3 and '3') as strings
+    
+    Arrow needs one type per column, so such columns would fail to convert.
+    Columns holding lists or dicts are left as they are.
     
     Args:
-        text (str): Text to analyze
-        mental_health_terms (list): List of mental health terms to look for
+        df (pd.DataFrame): Processed tweets
         
     Returns:
-        list: Found mental health terms
+        pd.DataFrame: Tweets with mixed scalar columns as the string dtype
     """
-    found_terms = []
-    text_lower = text.lower()
+    mixed = [
+        col for col in df.columns[df.dtypes == object]
+        if pd.api.types.infer_dtype(df[col], skipna=True) in ('mixed', 'mixed-integer')
+        and not df[col].map(lambda x: isinstance(x, (list, dict))).any()
+    ]
     
-    for term in mental_health_terms:
-        if term.lower() in text_lower:
-            found_terms.append(term)
-            
-    return found_terms
+    return df.astype({col: 'string' for col in mixed}) if mixed else df
+
+def save_processed_data(df, output_file):
+    """
+    Save processed tweets to Parquet
+    
+    Term lists are stored as native list columns.
+    
+    Args:
+        df (pd.DataFrame): Processed tweets
+        output_file (str): Path to the Parquet file
+    """
+    normalize_mixed_columns(df).to_parquet(output_file, compression='zstd', engine='pyarrow', index=False)
 
-def process_tweet_file(file_path, output_dir=None):
+def process_tweet_file(file_path, output_dir=None, write_output=True):
     """
     Process a JSON file containing tweets
     
     Args:
         file_path (str): Path to JSON file
         output_dir (str): Directory to save processed data
+        write_output (bool): Whether to save the processed data for this file
         
     Returns:
         pd.DataFrame: Processed tweets
@@ -138,55 +178,67 @@ def process_tweet_file(file_path, output_dir=None):
     
     try:
         # Load tweets
-        with open(file_path, 'r') as f:
-            tweets = json.load(f)
+        with open(file_path, 'rb') as f:
+            tweets = orjson.loads(f.read())
             
         if not tweets:
             print("No tweets found in file")
             return None
             
-        # Convert to DataFrame for easier processing
-        df = pd.DataFrame(tweets)
+        # Convert to DataFrame, flattening the nested user object into user.* columns
+        df = pd.json_normalize(tweets, max_level=1)
         
-        # Extract text from tweets if needed
-        if 'text' not in df.columns and isinstance(df.iloc[0], dict):
-            df['text'] = df.apply(lambda row: row.get('text', ''), axis=1)
+        # Keep the username as its own column for the database import
+        if 'user.username' in df.columns:
+            df['username'] = df.pop('user.username').fillna('')
+        else:
+            df['username'] = ''
             
-        # Clean tweets
-        df['cleaned_text'] = df['text'].apply(clean_tweet)
+        # Clean tweets, and lowercase the cleaned text once for term matching
+        df['cleaned_text'] = clean_tweets(df['text'])
+        cleaned_lower = df['cleaned_text'].str.lower()
+        
+        # Score each distinct cleaned text once (retweets collapse to the same
+        # text); the scores live only as long as this file's frame
+        codes, unique_texts = pd.factorize(df['cleaned_text'])
         
         # Analyze sentiment using TextBlob
-        textblob_sentiments = df['cleaned_text'].apply(analyze_sentiment_textblob)
-        df['textblob_polarity'] = textblob_sentiments.apply(lambda x: x['polarity'])
-        df['textblob_subjectivity'] = textblob_sentiments.apply(lambda x: x['subjectivity'])
-        df['textblob_category'] = textblob_sentiments.apply(lambda x: x['sentiment_category'])
+        textblob_scores = np.array([_textblob_scores(text) for text in unique_texts]).reshape(-1, 2)[codes]
+        df['textblob_polarity'], df['textblob_subjectivity'] = textblob_scores.T
+        
+        # Categorize all polarities at once
+        polarity = df['textblob_polarity'].to_numpy()
+        df['textblob_category'] = pd.Categorical(
+            np.where(polarity > 0, 'positive', np.where(polarity < 0, 'negative', 'neutral')),
+            categories=SENTIMENT_CATEGORIES
+        )
         
         # Analyze sentiment using VADER
-        vader_sentiments = df['cleaned_text'].apply(analyze_sentiment_vader)
-        df['vader_compound'] = vader_sentiments.apply(lambda x: x['compound'])
-        df['vader_positive'] = vader_sentiments.apply(lambda x: x['positive'])
-        df['vader_negative'] = vader_sentiments.apply(lambda x: x['negative'])
-        df['vader_neutral'] = vader_sentiments.apply(lambda x: x['neutral'])
-        df['vader_category'] = vader_sentiments.apply(lambda x: x['sentiment_category'])
+        vader_scores = np.array([_vader_scores(text) for text in unique_texts]).reshape(-1, 4)[codes]
+        (df['vader_compound'], df['vader_positive'], df['vader_negative'],
+         df['vader_neutral']) = vader_scores.T
+        
+        # Categorize all compound scores at once
+        compound = df['vader_compound'].to_numpy()
+        df['vader_category'] = pd.Categorical(
+            np.where(compound >= 0.05, 'positive', np.where(compound <= -0.05, 'negative', 'neutral')),
+            categories=SENTIMENT_CATEGORIES
+        )
         
         # Extract mental health terms
-        mental_health_terms = [
-            "mental health", "anxiety", "depression", "stress", "therapy", 
-            "self care", "mindfulness", "burnout", "mental wellbeing",
-            "mental illness", "panic attack", "insomnia", "mental wellness"
-        ]
-        df['mental_health_terms'] = df['cleaned_text'].apply(
-            lambda x: extract_mental_health_terms(x, mental_health_terms)
+        df['mental_health_terms'], df['contains_mental_health_term'] = find_mental_health_terms(
+            cleaned_lower
         )
-        df['contains_mental_health_term'] = df['mental_health_terms'].apply(lambda x: len(x) > 0)
         
         # Save processed data
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        base_filename = os.path.basename(file_path).split('.')[0]
-        output_file = os.path.join(output_dir, f"{base_filename}_processed_{timestamp}.csv")
-        df.to_csv(output_file, index=False)
-        
-        print(f"Processed data saved to {output_file}")
+        if write_output:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            base_filename = os.path.basename(file_path).split('.')[0]
+            output_file = os.path.join(output_dir, f"{base_filename}_processed_{timestamp}.parquet")
+            save_processed_data(df, output_file)
+            
+            print(f"Processed data saved to {output_file}")
+            
         return df
         
     except Exception as e:
@@ -216,15 +268,17 @@ def process_all_tweet_files(data_dir=None, output_dir=None):
         print(f"No tweet files found in {data_dir}")
         return None
         
-    all_dfs = []
+    file_paths = [os.path.join(data_dir, file) for file in all_files]
     
-    for file in all_files:
-        file_path = os.path.join(data_dir, file)
-        df = process_tweet_file(file_path, output_dir)
+    # Files are independent, so process them in parallel worker processes;
+    # only the combined data is saved
+    processes = min(multiprocessing.cpu_count(), len(file_paths))
+    with multiprocessing.Pool(processes) as pool:
+        results = pool.map(partial(process_tweet_file, output_dir=output_dir, write_output=False),
+                           file_paths)
         
-        if df is not None:
-            all_dfs.append(df)
-            
+    all_dfs = [df for df in results if df is not None]
+    
     if not all_dfs:
         print("No data processed")
         return None
@@ -232,12 +286,22 @@ def process_all_tweet_files(data_dir=None, output_dir=None):
     # Combine all DataFrames
     combined_df = pd.concat(all_dfs, ignore_index=True)
     
+    # Store the search keywords as a categorical (sentiment categories
+    # already share one categorical dtype across files)
+    if 'search_keyword' in combined_df.columns:
+        combined_df['search_keyword'] = combined_df['search_keyword'].astype('category')
+    
     # Save combined data
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    combined_file = os.path.join(output_dir, f"all_tweets_processed_{timestamp}.csv")
-    combined_df.to_csv(combined_file, index=False)
+    combined_file = os.path.join(output_dir, f"all_tweets_processed_{timestamp}.parquet")
     
-    print(f"Combined processed data saved to {combined_file}")
+    # Every file is already processed; a failed save shouldn't lose the data
+    try:
+        save_processed_data(combined_df, combined_file)
+        print(f"Combined processed data saved to {combined_file}")
+    except Exception as e:
+        print(f"Error saving combined data: {e}")
+        
     return combined_df
 
 def main():
@@ -8,6 +8,7 @@ import os
 import json
 import time
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Add path for data API access
@@ -25,6 +26,16 @@ MENTAL_HEALTH_KEYWORDS = [
     "mental illness", "panic attack", "insomnia", "mental wellness"
 ]
 
+# Keywords collected concurrently
+MAX_WORKERS = 4
+
+# Retries for failed API calls, with exponential backoff from RETRY_DELAY seconds
+MAX_RETRIES = 3
+RETRY_DELAY = 1
+
+# Seconds between result pages fetched by one worker
+PAGE_DELAY = 1
+
 # Initialize API client
 client = ApiClient()
 
@@ -39,23 +50,90 @@ def search_tweets(query, count=20, tweet_type="Top", cursor=None):
         cursor (str): Pagination cursor
         
     Returns:
-        dict: API response
+        dict: API response, or None if every attempt failed
     """
-    try:
-        params = {
-            'query': query,
-            'count': count,
-            'type': tweet_type
-        }
+    params = {
+        'query': query,
+        'count': count,
+        'type': tweet_type
+    }
+    
+    if cursor:
+        params['cursor'] = cursor
         
-        if cursor:
-            params['cursor'] = cursor
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            response = client.call_api('Twitter/search_twitter', query=params)
+        except Exception as e:
+            error = e
+        else:
+            if response and 'result' in response:
+                return response
+                
+            # Throttling can also come back as an error dict or an empty response
+            error = response.get('error', 'no results in response') if isinstance(response, dict) else 'empty response'
             
-        response = client.call_api('Twitter/search_twitter', query=params)
-        return response
-    except Exception as e:
-        print(f"Error searching tweets: {e}")
-        return None
+        if attempt == MAX_RETRIES:
+            print(f"Error searching tweets: {error}")
+            return None
+            
+        # Back off before retrying
+        delay = RETRY_DELAY * 2 ** attempt
+        print(f"Error searching tweets: {error}. Retrying in {delay}s")
+        time.sleep(delay)
+
+def collect_keyword_tweets(keyword, tweets_per_keyword=50):
+    """
+    Collect tweets for a single keyword, following pagination cursors
+    
+    Args:
+        keyword (str): Keyword to search for
+        tweets_per_keyword (int): Number of tweets to collect
+        
+    Returns:
+        list: Collected tweets
+    """
+    print(f"Collecting tweets for keyword: {keyword}")
+    tweets = []
+    cursor = None
+    
+    while len(tweets) < tweets_per_keyword:
+        response = search_tweets(keyword, count=20, tweet_type="Latest", cursor=cursor)
+        
+        if not response or 'result' not in response:
+            print(f"No results found for keyword: {keyword}")
+            break
+            
+        # Extract tweets from response
+        try:
+            timeline = response['result']['timeline']
+            instructions = timeline.get('instructions', [])
+            
+            for instruction in instructions:
+                if 'entries' in instruction:
+                    for entry in instruction['entries']:
+                        if 'content' in entry and 'entryType' in entry['content']:
+                            # Process tweet content
+                            tweet_data = extract_tweet_data(entry['content'])
+                            if tweet_data:
+                                tweet_data['search_keyword'] = keyword
+                                tweets.append(tweet_data)
+                                
+                                if len(tweets) >= tweets_per_keyword:
+                                    break
+        except Exception as e:
+            print(f"Error processing tweets: {e}")
+            
+        # Check if we have a cursor for pagination
+        if 'cursor' in response and 'bottom' in response['cursor']:
+            cursor = response['cursor']['bottom']
+        else:
+            break
+            
+        # Respect rate limits; each worker pages at most once per PAGE_DELAY
+        time.sleep(PAGE_DELAY)
+            
+    return tweets
 
 def collect_mental_health_tweets(keywords, tweets_per_keyword=50, output_file=None):
     """
@@ -71,47 +149,13 @@ def collect_mental_health_tweets(keywords, tweets_per_keyword=50, output_file=No
     """
     all_tweets = []
     
-    for keyword in keywords:
-        print(f"Collecting tweets for keyword: {keyword}")
-        collected = 0
-        cursor = None
+    # Keywords are independent, so collect them concurrently
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        results = executor.map(lambda keyword: collect_keyword_tweets(keyword, tweets_per_keyword),
+                               keywords)
         
-        while collected < tweets_per_keyword:
-            response = search_tweets(keyword, count=20, tweet_type="Latest", cursor=cursor)
-            
-            if not response or 'result' not in response:
-                print(f"No results found for keyword: {keyword}")
-                break
-                
-            # Extract tweets from response
-            try:
-                timeline = response['result']['timeline']
-                instructions = timeline.get('instructions', [])
-                
-                for instruction in instructions:
-                    if 'entries' in instruction:
-                        for entry in instruction['entries']:
-                            if 'content' in entry and 'entryType' in entry['content']:
-                                # Process tweet content
-                                tweet_data = extract_tweet_data(entry['content'])
-                                if tweet_data:
-                                    tweet_data['search_keyword'] = keyword
-                                    all_tweets.append(tweet_data)
-                                    collected += 1
-                                    
-                                    if collected >= tweets_per_keyword:
-                                        break
-            except Exception as e:
-                print(f"Error processing tweets: {e}")
-                
-            # Check if we have a cursor for pagination
-            if 'cursor' in response and 'bottom' in response['cursor']:
-                cursor = response['cursor']['bottom']
-            else:
-                break
-                
-            # Respect rate limits
-            time.sleep(1)
+        for tweets in results:
+            all_tweets.extend(tweets)
     
     # Save to file if specified
     if output_file: